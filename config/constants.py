@@ -10,6 +10,12 @@ RECORDINGS_DIR = AUDIO_FILES_DIR / "recordings"
 IMPORTS_DIR = AUDIO_FILES_DIR / "imports"
 BATCH_DIR = AUDIO_FILES_DIR / "batch"
 
+# Persistent LLM response cache
+LLM_CACHE_PATH = ROOT_DIR / ".llm_cache.db"
+
+# Content-addressed cache of AssemblyAI transcripts
+TRANSCRIPT_CACHE_DIR = Path.home() / ".cache" / "powerplay"
+
 # Ensure all directories exist
 for directory in [AUDIO_FILES_DIR, RECORDINGS_DIR, IMPORTS_DIR, BATCH_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
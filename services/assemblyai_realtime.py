@@ -1,16 +1,44 @@
-import assemblyai as aai
-import queue
-from typing import Optional, Dict, Any, Callable
+import logging
+import threading
+from collections import deque
+from typing import Optional, NamedTuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import assemblyai as aai
+
+logger = logging.getLogger(__name__)
+
+class TranscriptResult(NamedTuple):
+    """A single transcript result handed to the UI consumer"""
+    text: str
+    is_final: bool = True
+    timestamp: Optional[int] = None
+    speaker: Optional[str] = None
 
 class AssemblyAIRealTimeTranscription:
     """Handles real-time transcription using AssemblyAI's SDK"""
     
     def __init__(self, api_key: str, sample_rate: int = 16000):
+        # Imported here so the SDK is only loaded when a session starts
+        import assemblyai as aai
         aai.settings.api_key = api_key
+        # Cached for a single pointer compare in the transcript callback
+        self._final_t = aai.RealtimeFinalTranscript
         self.sample_rate = sample_rate
-        self.transcript_queue = queue.Queue()
+        # Single producer (SDK callback thread) / single consumer (UI worker):
+        # deque.append/popleft are atomic, so no lock is needed
+        self.transcript_queue = deque()
+        self._put = self.transcript_queue.append
+        # Set whenever a result is queued so the consumer can block instead
+        # of polling
+        self._ready = threading.Event()
         self.is_running = False
-        self._audio_data = bytearray()
+        
+        # Chunks shorter than ~80 ms are coalesced before streaming to
+        # amortize per-frame websocket/TLS overhead; larger ones (such as the
+        # recorder's 100 ms chunks) are streamed as they are
+        self._coalesce_buf = bytearray()
+        self._coalesce_target = int(sample_rate * 0.08) * 2
         
         # Initialize transcriber with partial transcripts disabled
         self.transcriber = aai.RealtimeTranscriber(
@@ -22,29 +50,25 @@ class AssemblyAIRealTimeTranscription:
             disable_partial_transcripts=True
         )
         
-    def _handle_open(self, session_opened: aai.RealtimeSessionOpened):
+    def _handle_open(self, session_opened: "aai.RealtimeSessionOpened"):
         """Internal handler for session open"""
-        print("Session ID:", session_opened.session_id)
+        logger.info("Session ID: %s", session_opened.session_id)
         
     def _handle_close(self):
         """Internal handler for session close"""
-        print("Session closed")
+        logger.info("Session closed")
         
-    def _handle_transcript(self, transcript: aai.RealtimeTranscript):
+    def _handle_transcript(self, transcript: "aai.RealtimeTranscript"):
         """Internal handler for transcripts"""
         if not transcript.text:
             return
             
         # Only process final transcripts
-        if isinstance(transcript, aai.RealtimeFinalTranscript):
-            result = {
-                'text': transcript.text,
-                'is_final': True,
-                'timestamp': None
-            }
-            self.transcript_queue.put(result)
+        if type(transcript) is self._final_t:
+            self._put(TranscriptResult(transcript.text))
+            self._ready.set()
         
-    def _handle_error(self, error: aai.RealtimeError):
+    def _handle_error(self, error: "aai.RealtimeError"):
         """Internal handler for errors"""
         if self.on_error:
             self.on_error(error)
@@ -58,22 +82,49 @@ class AssemblyAIRealTimeTranscription:
     def process_audio_chunk(self, audio_data: bytes):
         """Process incoming audio chunk"""
         if self.is_running:
-            self._audio_data.extend(audio_data)
-            self.transcriber.stream(audio_data)
-        
-    def get_next_transcription(self) -> Optional[Dict[str, Any]]:
-        """Get next available transcription result"""
+            # PyAudio hands us a fresh immutable bytes object per read, which
+            # the SDK can queue as-is. Only mutable/reused buffers need a
+            # private copy before it holds on to them.
+            if not isinstance(audio_data, bytes):
+                audio_data = bytes(audio_data)
+            if self._coalesce_buf or len(audio_data) < self._coalesce_target:
+                self._coalesce_buf += audio_data
+                if len(self._coalesce_buf) >= self._coalesce_target:
+                    self._flush_audio()
+            else:
+                self.transcriber.stream(audio_data)
+                
+    def _flush_audio(self):
+        """Stream any coalesced audio to the transcriber"""
+        if self._coalesce_buf:
+            self.transcriber.stream(bytes(self._coalesce_buf))
+            self._coalesce_buf.clear()
+            
+    def get_next_transcription(self, timeout: Optional[float] = 0) -> Optional[TranscriptResult]:
+        """Get next available transcription result, waiting up to timeout
+        seconds for one to arrive (None waits until one does)"""
+        try:
+            return self.transcript_queue.popleft()
+        except IndexError:
+            if timeout == 0:
+                return None
+        self._ready.clear()
+        # Re-check after clearing so a result queued in between is not missed
+        if not self.transcript_queue:
+            self._ready.wait(timeout)
         try:
-            return self.transcript_queue.get_nowait()
-        except queue.Empty:
+            return self.transcript_queue.popleft()
+        except IndexError:
             return None
             
-    def get_audio_data(self) -> bytes:
-        """Get recorded audio data"""
-        return bytes(self._audio_data)
-        
+    def interrupt(self):
+        """Wake a consumer blocked in get_next_transcription"""
+        self._ready.set()
+            
     def stop(self):
         """Stop transcription"""
         if self.is_running:
             self.is_running = False
+            self.interrupt()
+            self._flush_audio()
             self.transcriber.close()
@@ -1,118 +1,297 @@
 import os
-import assemblyai as aai
+import json
+import asyncio
+import hashlib
+import logging
+import numpy as np
+from config.constants import TRANSCRIPT_CACHE_DIR
 from .base_service import TranscriptionService
 
+logger = logging.getLogger(__name__)
+
+# UI config flags -> AssemblyAI TranscriptionConfig parameters
+FEATURE_PARAMS = {
+    'speaker_labels': 'speaker_labels',
+    'chapters': 'auto_chapters',
+    'entity': 'entity_detection',
+    'keyphrases': 'auto_highlights',
+    'summary': 'summarization',
+}
+
+# Status polling backoff for submitted batch jobs, in seconds
+POLL_INITIAL_DELAY = 2.0
+POLL_MAX_DELAY = 15.0
+
+# Section headers and the blank separator line between sections
+_H_SUMMARY = "=== Summary ==="
+_H_CHAPTERS = "=== Chapters ==="
+_H_ENTITIES = "=== Entities ==="
+_H_KEY_PHRASES = "=== Key Phrases ==="
+_H_TRANSCRIPT = "=== Transcript ==="
+_BLANK = ""
+
+# Block size for hashing audio files without loading them into memory
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Below this many items the scalar path is faster than building arrays
+VECTORIZE_MIN_ITEMS = 256
+
+def _format_timestamp(ms):
+    """Convert milliseconds to HH:MM:SS format"""
+    h, rem = divmod(int(ms) // 1000, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+def _format_timestamps(starts):
+    """Convert a list of millisecond start times to HH:MM:SS strings"""
+    if len(starts) < VECTORIZE_MIN_ITEMS:
+        return [_format_timestamp(ms) for ms in starts]
+    h, rem = np.divmod(np.asarray(starts, dtype=np.int64) // 1000, 3600)
+    m, s = np.divmod(rem, 60)
+    return [f"{a:02d}:{b:02d}:{c:02d}" for a, b, c in zip(h.tolist(), m.tolist(), s.tolist())]
+
 class AssemblyAITranscriptionService(TranscriptionService):
     def __init__(self):
         super().__init__()
         self.transcriber = None
+        self._config_cache = {}
+        self._aai = None
         
     def setup(self, api_key=None):
+        # Imported here so the SDK is only loaded when this service is used
+        import assemblyai as aai
+        self._aai = aai
         aai.settings.api_key = api_key or os.getenv('ASSEMBLYAI_API_KEY')
-        self.transcriber = aai.Transcriber()
+        # The Transcriber holds no per-job state and reads the key from the
+        # global settings, so one instance is shared across runs and threads
+        if self.transcriber is None:
+            self.transcriber = aai.Transcriber()
         
     def transcribe(self, file_path, config=None):
-        print(f"AssemblyAI: Starting transcription for {file_path}")
+        logger.info("AssemblyAI: Starting transcription for %s", file_path)
+        config = config or {}
         if not self.transcriber:
             raise ValueError("AssemblyAI transcriber not initialized")
             
-        try:
-            # Configure enabled features
-            config_params = {
-                'speech_model': (aai.SpeechModel.best 
-                               if config.get('model') == 'best' 
-                               else aai.SpeechModel.nano)
-            }
-            print(f"AssemblyAI: Using config params: {config_params}")
+        # Same audio with the same options is served from the disk cache
+        cache_key = self._cache_key(file_path, config)
+        cached = self._load_cached(cache_key)
+        if cached is not None:
+            return cached
             
-            if config:
-                if config.get('speaker_labels'):
-                    config_params['speaker_labels'] = True
-                if config.get('chapters'):
-                    config_params['auto_chapters'] = True
-                if config.get('entity'):
-                    config_params['entity_detection'] = True
-                if config.get('keyphrases'):
-                    config_params['auto_highlights'] = True
-                if config.get('summary'):
-                    config_params['summarization'] = True
-                    
-            transcription_config = aai.TranscriptionConfig(**config_params)
+        try:
+            transcription_config = self._get_transcription_config(config)
             
             transcript = self.transcriber.transcribe(
                 file_path,
                 transcription_config
             )
             
-            if transcript.status == aai.TranscriptStatus.error:
+            if transcript.status == self._aai.TranscriptStatus.error:
                 raise Exception(f"Transcription failed: {transcript.error}")
                 
             # Build formatted output
             formatted_transcript = self.format_transcript(transcript, config)
-            print(f"Generated transcript length: {len(formatted_transcript)} chars")
+            logger.info("Generated transcript length: %d chars", len(formatted_transcript))
+            self._store_cached(cache_key, formatted_transcript, transcript)
             return formatted_transcript
             
         except Exception as e:
-            print(f"AssemblyAI: Error during transcription: {str(e)}")
+            logger.error("AssemblyAI: Error during transcription: %s", e)
             raise
             
+    def _cache_key(self, file_path, config):
+        """Hash the audio content and options, streaming the file in blocks"""
+        digest = hashlib.blake2b()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+        
+    def _load_cached(self, cache_key):
+        """Return the cached formatted transcript for a key, or None"""
+        cached_path = TRANSCRIPT_CACHE_DIR / f"{cache_key}.txt"
+        if not cached_path.exists():
+            return None
+        logger.info("AssemblyAI: Using cached transcript %s", cached_path.name)
+        return cached_path.read_text(encoding="utf-8")
+        
+    def _store_cached(self, cache_key, formatted_transcript, transcript):
+        """Write the formatted and raw transcript to the cache"""
+        try:
+            TRANSCRIPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            (TRANSCRIPT_CACHE_DIR / f"{cache_key}.json").write_text(
+                json.dumps(transcript.json_response), encoding="utf-8")
+            (TRANSCRIPT_CACHE_DIR / f"{cache_key}.txt").write_text(
+                formatted_transcript, encoding="utf-8")
+        except OSError as e:
+            logger.warning("AssemblyAI: Could not cache transcript: %s", e)
+            
+    def transcribe_many(self, file_paths, config=None, on_result=None, stop_event=None):
+        """Transcribe several files with all jobs in flight at once
+        
+        Returns formatted transcripts in the same order as file_paths; a file
+        that failed has its exception in place of its transcript.
+        """
+        return asyncio.run(self.atranscribe_many(file_paths, config, on_result, stop_event))
+        
+    async def atranscribe_many(self, file_paths, config=None, on_result=None, stop_event=None):
+        """Submit every uncached file up front, then poll the jobs concurrently
+        
+        Args:
+            file_paths: Audio files to transcribe
+            config: Transcription options
+            on_result: Called with (index, transcript or exception) as each
+                file finishes, cached files first
+            stop_event: When set, jobs still running are no longer waited
+                for and their results are left as None
+        """
+        config = config or {}
+        if not self.transcriber:
+            raise ValueError("AssemblyAI transcriber not initialized")
+            
+        transcription_config = self._get_transcription_config(config)
+        loop = asyncio.get_running_loop()
+        results = [None] * len(file_paths)
+        
+        def finish(index, result):
+            results[index] = result
+            if on_result:
+                on_result(index, result)
+                
+        # Files already transcribed with the same options come from the cache
+        cache_keys = await asyncio.gather(*(
+            loop.run_in_executor(None, self._cache_key, path, config)
+            for path in file_paths
+        ), return_exceptions=True)
+        misses = []
+        for index, key in enumerate(cache_keys):
+            cached = key if isinstance(key, Exception) else self._load_cached(key)
+            if cached is None:
+                misses.append(index)
+            else:
+                finish(index, cached)
+                
+        async def run(index):
+            try:
+                # submit() uploads and queues without waiting for completion
+                submitted = await loop.run_in_executor(
+                    None, self.transcriber.submit, file_paths[index], transcription_config)
+                transcript = await self._poll_transcript(submitted.id)
+                formatted_transcript = self.format_transcript(transcript, config)
+                self._store_cached(cache_keys[index], formatted_transcript, transcript)
+                return index, formatted_transcript
+            except Exception as e:
+                return index, e
+                
+        logger.info("AssemblyAI: Submitting %d of %d files", len(misses), len(file_paths))
+        pending = {asyncio.ensure_future(run(index)) for index in misses}
+        try:
+            # Results are handed on as each job finishes; the stop event is
+            # checked at least once a second
+            while pending and not (stop_event and stop_event.is_set()):
+                done, pending = await asyncio.wait(
+                    pending, timeout=1.0, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    finish(*task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+        return results
+        
+    async def _poll_transcript(self, transcript_id):
+        """Poll a submitted job with exponential backoff until it completes"""
+        aai = self._aai
+        loop = asyncio.get_running_loop()
+        delay = POLL_INITIAL_DELAY
+        while True:
+            transcript = await loop.run_in_executor(None, aai.Transcript.get_by_id, transcript_id)
+            if transcript.status == aai.TranscriptStatus.completed:
+                return transcript
+            if transcript.status == aai.TranscriptStatus.error:
+                raise Exception(f"Transcription failed: {transcript.error}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, POLL_MAX_DELAY)
+            
+    def _get_transcription_config(self, config):
+        """Build a TranscriptionConfig once per distinct set of options"""
+        key = (config.get('model'),
+               tuple(bool(config.get(flag)) for flag in FEATURE_PARAMS))
+        transcription_config = self._config_cache.get(key)
+        if transcription_config is None:
+            aai = self._aai
+            # Configure enabled features
+            config_params = {
+                'speech_model': (aai.SpeechModel.best
+                               if config.get('model') == 'best'
+                               else aai.SpeechModel.nano)
+            }
+            for flag, param in FEATURE_PARAMS.items():
+                if config.get(flag):
+                    config_params[param] = True
+            logger.info("AssemblyAI: Using config params: %s", config_params)
+            transcription_config = aai.TranscriptionConfig(**config_params)
+            self._config_cache[key] = transcription_config
+        return transcription_config
+        
     def format_transcript(self, transcript, config):
         """Format the transcript with all enabled features"""
         formatted_text = []
             
-        def format_timestamp(ms):
-            """Convert milliseconds to HH:MM:SS format"""
-            seconds = int(ms / 1000)
-            hours = seconds // 3600
-            minutes = (seconds % 3600) // 60
-            seconds = seconds % 60
-            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            
         # Add summary if enabled
         if config.get('summary') and transcript.summary:
-            formatted_text.append("=== Summary ===")
+            formatted_text.append(_H_SUMMARY)
             formatted_text.append(transcript.summary)
-            formatted_text.append("\n")
+            formatted_text.append(_BLANK)
             
         # Add chapters if enabled
         if config.get('chapters') and transcript.chapters:
-            formatted_text.append("=== Chapters ===")
+            formatted_text.append(_H_CHAPTERS)
             for chapter in transcript.chapters:
                 formatted_text.append(f"{chapter.headline}")
                 formatted_text.append(f"Start: {chapter.start}ms")
                 formatted_text.append(f"Summary: {chapter.summary}")
-                formatted_text.append("")
-            formatted_text.append("\n")
+                formatted_text.append(_BLANK)
             
         # Add entities if enabled
         if config.get('entity') and transcript.entities:
-            formatted_text.append("=== Entities ===")
+            formatted_text.append(_H_ENTITIES)
             for entity in transcript.entities:
                 formatted_text.append(f"{entity.text} ({entity.entity_type})")
-            formatted_text.append("\n")
+            formatted_text.append(_BLANK)
             
         # Add key phrases if enabled
         if config.get('keyphrases') and transcript.key_phrases:
-            formatted_text.append("=== Key Phrases ===")
+            formatted_text.append(_H_KEY_PHRASES)
             for phrase in transcript.key_phrases:
                 formatted_text.append(phrase)
-            formatted_text.append("\n")
+            formatted_text.append(_BLANK)
             
         # Add main transcript
-        formatted_text.append("=== Transcript ===")
+        formatted_text.append(_H_TRANSCRIPT)
+        timestamps = config.get('timestamps')
         if config.get('speaker_labels'):
-            for utterance in transcript.utterances:
-                if config.get('timestamps'):
-                    start_time = format_timestamp(utterance.start)
-                    formatted_text.append(f"[{start_time}] Speaker {utterance.speaker}: {utterance.text}")
-                else:
-                    formatted_text.append(f"Speaker {utterance.speaker}: {utterance.text}")
+            if timestamps:
+                utterances = transcript.utterances
+                start_times = _format_timestamps([u.start for u in utterances])
+                formatted_text.extend([
+                    f"[{start_time}] Speaker {u.speaker}: {u.text}"
+                    for start_time, u in zip(start_times, utterances)
+                ])
+            else:
+                formatted_text.extend([
+                    f"Speaker {u.speaker}: {u.text}" for u in transcript.utterances
+                ])
         else:
-            if config.get('timestamps'):
+            if timestamps:
                 # Get sentences with timestamps
-                for sentence in transcript.get_sentences():
-                    start_time = format_timestamp(sentence.start)
-                    formatted_text.append(f"[{start_time}] {sentence.text}")
+                sentences = transcript.get_sentences()
+                start_times = _format_timestamps([sentence.start for sentence in sentences])
+                formatted_text.extend([
+                    f"[{start_time}] {sentence.text}"
+                    for start_time, sentence in zip(start_times, sentences)
+                ])
             else:
                 formatted_text.append(transcript.text)
             
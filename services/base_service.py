@@ -1,9 +1,7 @@
 import os
-from dotenv import load_dotenv
 
 class TranscriptionService:
     def __init__(self):
-        load_dotenv()
         pass
         
     def setup(self, api_key):
@@ -11,3 +9,7 @@ class TranscriptionService:
         
     def transcribe(self, file_path, config=None):
         raise NotImplementedError
+        
+    def transcribe_stream(self, file_path, config=None):
+        """Yield transcript text incrementally; defaults to one full block"""
+        yield self.transcribe(file_path, config)
@@ -1,24 +1,79 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Iterator
 import os
-from dotenv import load_dotenv
-from langchain_community.chat_models import ChatOpenAI
-from langchain.schema.messages import SystemMessage, HumanMessage
+import asyncio
+import logging
+from collections import deque
+from config.constants import LLM_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+# Cheap model for routine chunks; larger prompts go to the standard model
+MINI_MODEL = "gpt-4o-mini"
+STANDARD_MODEL = "gpt-4o"
+ROUTE_STANDARD_TOKENS = 3000
+# Model to retry with when a model is rate limited or erroring
+FALLBACK_MODELS = {MINI_MODEL: STANDARD_MODEL}
 
 class LangChainService:
     """Handles real-time processing of text chunks using LangChain"""
     
     def __init__(self):
-        load_dotenv()
         self.api_key = os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OpenAI API key not found in environment variables")
             
-        self.llm = ChatOpenAI(
-            temperature=0.7,
-            openai_api_key=self.api_key
+        # Imported here so LangChain is only loaded when the service is created
+        import openai
+        from langchain_openai import ChatOpenAI
+        from langchain_community.cache import SQLiteCache
+        
+        # Identical analysis prompts (same template, context and chunk) are
+        # answered from a local cache instead of calling the model again.
+        # It is attached to the analysis models only, not set globally.
+        self._llm_cache = SQLiteCache(database_path=str(LLM_CACHE_PATH))
+        
+        # Chat models are created lazily per routed model and reused
+        self._chat_model = ChatOpenAI
+        self._llms: Dict[str, Any] = {}
+        self._router = {
+            "Meeting Summary": MINI_MODEL,
+            "Action Items": MINI_MODEL,
+            "Decision Tracking": STANDARD_MODEL,
+        }
+        self._retryable = (openai.RateLimitError, openai.InternalServerError)
+        self.llm = self._get_llm(MINI_MODEL)
+        # Cheap model used to fold older chunks into a running summary
+        self.summary_llm = ChatOpenAI(
+            model=MINI_MODEL,
+            temperature=0,
+            api_key=self.api_key
         )
-        self.context_window = []
-        self.max_context_chunks = 5
+        
+        # Context is a running summary plus the last verbatim chunk, so the
+        # prompt stays bounded no matter how long the meeting runs
+        self.running_summary = ""
+        self.summarize_every = 3
+        self._unsummarized = []
+        self.context_window = deque(maxlen=1)
+        self.max_context_tokens = 1500
+        self.max_input_tokens = 6000
+        
+        # Encoder is created on first use, since tiktoken may have to download
+        # it; fixed template prompts are tokenized once and cached so each
+        # call only encodes the variable text
+        self._encoder = None
+        self._template_tokens: Dict[tuple, int] = {}
+        self.last_cached_tokens = 0
+        
+    @property
+    def _enc(self):
+        """Token encoder for the routed models, loaded on first use"""
+        if self._encoder is None:
+            import tiktoken
+            # gpt-4o and gpt-4o-mini, the models prompts are routed to, both
+            # use o200k_base
+            self._encoder = tiktoken.get_encoding("o200k_base")
+        return self._encoder
         
     def process_chunk(self, chunk: str, template: Dict[str, str]) -> str:
         """
@@ -31,22 +86,208 @@ class LangChainService:
         Returns:
             Processed response
         """
-        # Add chunk to context window
+        messages, model = self._start_chunk(chunk, template)
+        
+        # invoke() (unlike stream()) consults the LLM cache, so a repeated
+        # prompt is answered locally. A failing model is retried on its fallback.
+        while True:
+            try:
+                response = self._get_llm(model).invoke(messages)
+                break
+            except self._retryable as e:
+                if model not in FALLBACK_MODELS:
+                    raise
+                logger.warning("%s unavailable (%s), falling back to %s",
+                               model, e, FALLBACK_MODELS[model])
+                model = FALLBACK_MODELS[model]
+                
+        self._record_usage(response.usage_metadata)
+        self._finish_chunk()
+        return response.content
+        
+    def stream_chunk(self, chunk: str, template: Dict[str, str]) -> Iterator[str]:
+        """
+        Process a chunk of text, yielding the response as tokens arrive
+        
+        Streaming bypasses the LLM cache; use process_chunk when the
+        response is not shown incrementally.
+        
+        Args:
+            chunk: Text chunk to process
+            template: Dictionary containing system and user prompts
+            
+        Yields:
+            Pieces of the response text
+        """
+        messages, model = self._start_chunk(chunk, template)
+        
+        # Stream the response from the LLM; usage arrives on the last event.
+        # A failing model is retried on its fallback until output has started.
+        while True:
+            started = False
+            try:
+                for event in self._get_llm(model).stream(messages):
+                    self._record_usage(event.usage_metadata)
+                    if event.content:
+                        started = True
+                        yield event.content
+                break
+            except self._retryable as e:
+                if started or model not in FALLBACK_MODELS:
+                    raise
+                logger.warning("%s unavailable (%s), falling back to %s",
+                               model, e, FALLBACK_MODELS[model])
+                model = FALLBACK_MODELS[model]
+                
+        self._finish_chunk()
+        
+    def _start_chunk(self, chunk: str, template: Dict[str, str]) -> Tuple[list, str]:
+        """Build the messages and pick the model for a chunk, then add the
+        chunk to the context window for the next call"""
+        messages, prompt_tokens = self._build_messages(chunk, template, self.context_window)
+        model = self._route(template, prompt_tokens)
         self.context_window.append(chunk)
-        if len(self.context_window) > self.max_context_chunks:
-            self.context_window.pop(0)
+        self._unsummarized.append(chunk)
+        return messages, model
+        
+    def _finish_chunk(self):
+        """Fold older chunks into the running summary once enough have built up"""
+        if len(self._unsummarized) >= self.summarize_every:
+            self._update_summary()
             
-        # Create messages for the chat model
-        messages = [
+    def _record_usage(self, usage_metadata):
+        """Remember how many prompt tokens the provider served from its cache"""
+        if usage_metadata:
+            details = usage_metadata.get("input_token_details") or {}
+            self.last_cached_tokens = details.get("cache_read", 0)
+            
+    async def aprocess_chunk(self, chunk: str, template: Dict[str, str],
+                             previous: List[str] = ()) -> str:
+        """
+        Process a chunk asynchronously without touching the shared context window
+        
+        Args:
+            chunk: Text chunk to process
+            template: Dictionary containing system and user prompts
+            previous: Verbatim chunks to include as context
+            
+        Returns:
+            Processed response
+        """
+        messages, prompt_tokens = self._build_messages(chunk, template, previous)
+        model = self._route(template, prompt_tokens)
+        while True:
+            try:
+                response = await self._get_llm(model).ainvoke(messages)
+                return response.content
+            except self._retryable:
+                if model not in FALLBACK_MODELS:
+                    raise
+                model = FALLBACK_MODELS[model]
+                
+    def _route(self, template: Dict[str, str], prompt_tokens: int) -> str:
+        """Pick the cheapest model suited to the template and prompt size"""
+        if prompt_tokens > ROUTE_STANDARD_TOKENS:
+            return STANDARD_MODEL
+        return self._router.get(template.get("name"), MINI_MODEL)
+        
+    def _get_llm(self, model: str):
+        """Get the streaming chat model for a model name, creating it once"""
+        llm = self._llms.get(model)
+        if llm is None:
+            llm = self._chat_model(
+                model=model,
+                temperature=0.7,
+                streaming=True,
+                stream_usage=True,
+                max_retries=2,
+                cache=self._llm_cache,
+                api_key=self.api_key
+            )
+            self._llms[model] = llm
+        return llm
+        
+    async def aprocess_chunks(self, chunks: List[str], template: Dict[str, str],
+                              max_concurrency: int = 16) -> List[str]:
+        """
+        Process many chunks concurrently, each with its preceding chunk as context
+        
+        Args:
+            chunks: Text chunks in transcript order
+            template: Dictionary containing system and user prompts
+            max_concurrency: Maximum number of in-flight requests
+            
+        Returns:
+            Processed responses in the same order as chunks
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(index, chunk):
+            previous = [chunks[index - 1]] if index else list(self.context_window)
+            async with semaphore:
+                return await self.aprocess_chunk(chunk, template, previous)
+                
+        return await asyncio.gather(*(run(i, chunk) for i, chunk in enumerate(chunks)))
+        
+    def process_chunks(self, chunks: List[str], template: Dict[str, str],
+                       max_concurrency: int = 16) -> List[str]:
+        """Synchronous wrapper around aprocess_chunks"""
+        return asyncio.run(self.aprocess_chunks(chunks, template, max_concurrency))
+        
+    def _build_messages(self, chunk: str, template: Dict[str, str], previous) -> Tuple[list, int]:
+        """Build chat messages for a chunk given its verbatim context chunks,
+        returning them with the prompt's token count"""
+        # Messages are ordered from most to least stable (instructions,
+        # rolling context, current chunk) so the provider's prompt prefix
+        # cache can reuse the leading tokens across calls
+        context = "\n\n".join(filter(None, [self.running_summary, *previous]))
+        context, context_tokens = self._truncate_tokens(context, self.max_context_tokens)
+        
+        # Short-circuit before the network call if the prompt is over budget
+        prompt_tokens = (self._count_template_tokens(template) + context_tokens
+                         + len(self._enc.encode(chunk)))
+        if prompt_tokens > self.max_input_tokens:
+            raise ValueError(f"Prompt of {prompt_tokens} tokens exceeds the "
+                             f"{self.max_input_tokens} token input budget")
+            
+        from langchain_core.messages import SystemMessage, HumanMessage
+        return [
             SystemMessage(content=template["system"]),
             HumanMessage(content=f"{template['user']}\n\nContext (previous chunks):\n"
-                                f"{' '.join(self.context_window[:-1])}\n\n"
-                                f"Current chunk:\n{chunk}")
-        ]
+                                f"{context}"),
+            HumanMessage(content=f"Current chunk:\n{chunk}")
+        ], prompt_tokens
         
-        # Get response from LLM
-        response = self.llm(messages)
-        return response.content
+    def _count_template_tokens(self, template: Dict[str, str]) -> int:
+        """Token count of a template's fixed prompts, computed once per template"""
+        key = (template["system"], template["user"])
+        count = self._template_tokens.get(key)
+        if count is None:
+            count = len(self._enc.encode(key[0])) + len(self._enc.encode(key[1]))
+            self._template_tokens[key] = count
+        return count
+        
+    def _update_summary(self):
+        """Fold recent chunks into the running summary using the cheap model"""
+        from langchain_core.messages import SystemMessage, HumanMessage
+        text = "\n".join([self.running_summary, *self._unsummarized]).strip()
+        messages = [
+            SystemMessage(content="You compress meeting transcripts."),
+            HumanMessage(content=f"Compress the following to at most 200 tokens, "
+                                f"keeping decisions, action items and names:\n\n{text}")
+        ]
+        try:
+            self.running_summary = self.summary_llm.invoke(messages).content
+            self._unsummarized.clear()
+        except Exception as e:
+            logger.error("Error updating running summary: %s", e)
+            
+    def _truncate_tokens(self, text: str, max_tokens: int) -> Tuple[str, int]:
+        """Keep only the most recent max_tokens tokens of text, returning the count"""
+        tokens = self._enc.encode(text)
+        if len(tokens) <= max_tokens:
+            return text, len(tokens)
+        return self._enc.decode(tokens[-max_tokens:]), max_tokens
         
     def get_available_templates(self) -> List[Dict[str, str]]:
         """Get list of available templates"""
@@ -1,31 +1,137 @@
 import os
-from openai import OpenAI
+import re
+import logging
+import time
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pydub import AudioSegment
 from .base_service import TranscriptionService
 
+logger = logging.getLogger(__name__)
+
+# Files above this size are split and transcribed in parallel
+SINGLE_REQUEST_BYTES = 5 * 1024 * 1024
+CHUNK_MS = 5 * 60 * 1000
+MAX_WORKERS = 8
+MAX_RETRIES = 5
+
+_SRT_TIME = re.compile(r'(\d{2}):(\d{2}):(\d{2}),(\d{3})')
+
+def _shift_srt_times(text, offset_ms):
+    """Shift every SRT timestamp in text by offset_ms"""
+    def shift(match):
+        h, m, s, ms = map(int, match.groups())
+        total = ((h * 60 + m) * 60 + s) * 1000 + ms + offset_ms
+        h, rem = divmod(total, 3600000)
+        m, rem = divmod(rem, 60000)
+        s, ms = divmod(rem, 1000)
+        return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+    return _SRT_TIME.sub(shift, text)
+
 class OpenAITranscriptionService(TranscriptionService):
     def __init__(self):
         super().__init__()
         self.client = None
         self.model = "whisper-1"
+        self._http = None
+        self._openai = None
         
     def setup(self, api_key=None):
-        self.client = OpenAI(api_key=api_key or os.getenv('OPENAI_API_KEY'))
+        # Imported here so the SDK is only loaded when this service is used
+        import httpx
+        import openai
+        self._openai = openai
+        # One pooled HTTP/2 keep-alive client is shared across setups and
+        # parallel chunk workers so connections are not re-handshaken
+        if self._http is None:
+            self._http = httpx.Client(
+                http2=True,
+                timeout=httpx.Timeout(300.0, connect=10.0),
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            )
+        self.client = openai.OpenAI(api_key=api_key or os.getenv('OPENAI_API_KEY'),
+                             http_client=self._http)
+        
+    def close(self):
+        """Close the pooled HTTP client"""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+            self.client = None
         
     def transcribe(self, file_path, config=None):
-        print(f"OpenAI: Starting transcription for {file_path}")
-        if not self.client:
-            raise ValueError("OpenAI client not initialized")
-            
+        logger.info("OpenAI: Starting transcription for %s", file_path)
         try:
-            with open(file_path, "rb") as audio_file:
-                print("OpenAI: File opened successfully")
-                response = self.client.audio.transcriptions.create(
-                    model=self.model,
-                    file=audio_file,
-                    response_format="srt"
-                )
-                print("OpenAI: Transcription completed")
-                return response
+            response = "".join(self.transcribe_stream(file_path, config))
+            logger.info("OpenAI: Transcription completed")
+            return response
         except Exception as e:
-            print(f"OpenAI: Error during transcription: {str(e)}")
+            logger.error("OpenAI: Error during transcription: %s", e)
             raise
+            
+    def transcribe_stream(self, file_path, config=None):
+        """Yield SRT text as soon as each part of the file is transcribed"""
+        if not self.client:
+            raise ValueError("OpenAI client not initialized")
+            
+        if os.path.getsize(file_path) <= SINGLE_REQUEST_BYTES:
+            yield self._transcribe_file(file_path)
+        else:
+            yield from self._transcribe_chunked(file_path)
+            
+    def _transcribe_file(self, file_path):
+        """Send a single file to Whisper, backing off on rate limits"""
+        for attempt in range(MAX_RETRIES):
+            try:
+                # Pass the open file object so the multipart body is streamed
+                # from disk rather than read into memory first
+                with open(file_path, "rb") as audio_file:
+                    return self.client.audio.transcriptions.create(
+                        model=self.model,
+                        file=(os.path.basename(file_path), audio_file),
+                        response_format="srt"
+                    )
+            except self._openai.RateLimitError:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                time.sleep(2 ** attempt)
+                
+    def _transcribe_chunked(self, file_path):
+        """Split audio into fixed-length chunks, transcribe them concurrently
+        and yield each chunk's SRT blocks in order as soon as it is ready"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            chunk_paths = self._split_audio(file_path, temp_dir)
+            offsets = [i * CHUNK_MS for i in range(len(chunk_paths))]
+            logger.info("OpenAI: Split into %d chunks", len(chunk_paths))
+            
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                futures = [executor.submit(self._transcribe_file, path) for path in chunk_paths]
+                
+                # Shift each chunk's SRT blocks by its offset and renumber
+                number = 0
+                for offset, future in zip(offsets, futures):
+                    parts = []
+                    for block in future.result().strip().split("\n\n"):
+                        lines = block.strip().split("\n")
+                        if len(lines) < 2:
+                            continue
+                        number += 1
+                        text = _shift_srt_times("\n".join(lines[1:]), offset)
+                        parts.append(f"{number}\n{text}\n\n")
+                    yield "".join(parts)
+                    
+    def _split_audio(self, file_path, temp_dir):
+        """Cut the file into CHUNK_MS MP3 segments with ffmpeg, which streams
+        from disk instead of decoding the whole file into memory"""
+        pattern = os.path.join(temp_dir, "chunk_%04d.mp3")
+        subprocess.run([
+            AudioSegment.converter, "-v", "error", "-i", file_path, "-vn",
+            "-f", "segment", "-segment_time", str(CHUNK_MS // 1000),
+            "-reset_timestamps", "1", "-c:a", "libmp3lame", "-b:a", "128k",
+            pattern
+        ], check=True)
+        return sorted(
+            os.path.join(temp_dir, name) for name in os.listdir(temp_dir)
+            if name.startswith("chunk_")
+        )
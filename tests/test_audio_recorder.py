@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+import wave
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from utils.audio_recorder import AudioRecorder
+except ImportError:  # pyaudio/pydub not installed
+    AudioRecorder = None
+
+
+@unittest.skipIf(AudioRecorder is None, "audio dependencies not installed")
+class AudioRecorderTest(unittest.TestCase):
+    def setUp(self):
+        with mock.patch('pyaudio.PyAudio') as pyaudio_cls:
+            pyaudio_cls.return_value.get_sample_size.return_value = 2
+            self.recorder = AudioRecorder(rate=16000, chunk=1600)
+
+    def _encoded_pcm(self, frames):
+        """PCM in the WAV that encode_mp3 hands to pydub"""
+        with mock.patch('utils.audio_recorder.AudioSegment') as segment:
+            self.recorder.encode_mp3(frames)
+        wav_buffer = segment.from_wav.call_args[0][0]
+        wav_buffer.seek(0)
+        with wave.open(wav_buffer, 'rb') as wf:
+            return wf.readframes(wf.getnframes())
+
+    def test_encodes_frames_after_recorder_restarts(self):
+        self.recorder.start()
+        chunk = b'\x01\x00' * 1600
+        for _ in range(10):
+            self.recorder._on_audio(chunk, 1600, None, 0)
+        frames = self.recorder.stop()
+
+        # A new recording rebinds the recorder's frames before the save runs
+        self.recorder.start()
+        self.recorder._on_audio(b'\x02\x00' * 1600, 1600, None, 0)
+
+        self.assertEqual(self._encoded_pcm(frames), chunk * 10)
+
+    def test_stop_without_start_returns_no_frames(self):
+        self.recorder.start()
+        self.recorder._on_audio(b'\x01\x00' * 1600, 1600, None, 0)
+        self.assertEqual(len(self.recorder.stop()), 1)
+
+        # A failed start leaves no stream, so the last session is not resaved
+        self.assertEqual(self.recorder.stop(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import re
+import sys
+import types
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui.media_player import MediaPlayerFrame, _line_starts, _match_indices
+
+
+def _index(text, term):
+    """Tk indices of every match of term, as search_transcript computes them"""
+    pattern = re.compile(re.escape(term), re.IGNORECASE)
+    return _match_indices(pattern, text, _line_starts(text))
+
+
+class TkIndicesTest(unittest.TestCase):
+    def test_plain_text(self):
+        text = "hello world\nsay hello"
+        self.assertEqual(_index(text, "hello"), ["1.0", "1.5", "2.4", "2.9"])
+
+    def test_marker_line_counts_flag_as_two_columns(self):
+        text = "[00:01] Speaker A: first\n[00:02] Speaker A:  🚩 decision made\nnext decision"
+        self.assertEqual(_index(text, "decision"), ["2.23", "2.31", "3.5", "3.13"])
+
+    def test_no_match(self):
+        self.assertEqual(_index("hello\nworld", "absent"), [])
+
+
+class SearchTranscriptTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import tkinter as tk
+            self.root = tk.Tk()
+        except Exception as e:
+            self.skipTest(f"No display available: {e}")
+        self.widget = tk.Text(self.root)
+        # Only the attributes search_transcript uses, on a real Text widget
+        self.frame = types.SimpleNamespace(
+            transcript_text=self.widget,
+            search_var=tk.StringVar(self.root),
+            _search_patterns={},
+        )
+        self.frame._index_transcript = (
+            lambda text: MediaPlayerFrame._index_transcript(self.frame, text))
+
+    def tearDown(self):
+        self.root.destroy()
+
+    def _search(self, term):
+        self.frame.search_var.set(term)
+        MediaPlayerFrame.search_transcript(self.frame)
+        ranges = self.widget.tag_ranges('search')
+        return [self.widget.get(first, last) for first, last in zip(ranges[::2], ranges[1::2])]
+
+    def test_highlights_matches_after_markers(self):
+        self.widget.insert('1.0', "a 🚩 b 🚩 target\n🚩🚩 Target")
+        self.assertEqual(self._search("target"), ["target", "Target"])
+
+    def test_reindexes_after_edit(self):
+        self.widget.insert('1.0', "first target")
+        self.assertEqual(self._search("target"), ["target"])
+        self.widget.insert('1.0', "🚩 another target\n")
+        self.assertEqual(self._search("target"), ["target", "target"])
+
+
+if __name__ == '__main__':
+    unittest.main()
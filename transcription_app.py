@@ -3,6 +3,10 @@ from tkinter import filedialog, messagebox, ttk
 import os
 import threading
 import datetime
+import logging
+import logging.handlers
+import queue
+from dotenv import load_dotenv
 from services.openai_service import OpenAITranscriptionService
 from services.assemblyai_service import AssemblyAITranscriptionService
 from ui.main_window import MainWindow
@@ -113,38 +117,42 @@ class TranscriptionApp:
         self.main_window.progress_frame.status_var.set(f"Starting transcription of {total_files} files...")
         self.main_window.progress_frame.overall_progress['value'] = 0
         
+        # Files with an existing transcript are skipped up front
+        pending = []
         for file_name in mp3_files:
-            if self.stop_event.is_set():
-                self.main_window.progress_frame.status_var.set("Transcription stopped by user")
-                break
-            
             if transcript_status.get(file_name, False):
-                # Skip files with existing transcripts
                 self.main_window.progress_frame.add_file_result(
                     file_name, "Skipped (Transcript Exists)")
                 skipped_files += 1
                 processed_count += 1
-                continue
+            else:
+                pending.append(file_name)
                 
-            file_path = os.path.join(folder_path, file_name)
-            self.main_window.progress_frame.update_progress(file_name, processed_count, total_files)
+        # Get transcription config
+        config = {
+            'model': self.main_window.model_frame.model_var.get(),
+            'speaker_labels': self.main_window.model_frame.speaker_var.get(),
+            'chapters': self.main_window.model_frame.chapters_var.get(),
+            'entity': self.main_window.model_frame.entity_var.get(),
+            'keyphrases': self.main_window.model_frame.keyphrases_var.get(),
+            'summary': self.main_window.model_frame.summary_var.get(),
+            'timestamps': self.main_window.model_frame.timestamps_var.get()
+        }
+        print(f"Using config: {config}")
+        
+        # Services that can batch (AssemblyAI) have every file in flight at
+        # once; the others transcribe one file at a time
+        if len(pending) > 1 and hasattr(self.current_service, 'transcribe_many'):
+            results = self._transcribe_batch(folder_path, pending, config,
+                                             processed_count, total_files)
+        else:
+            results = self._transcribe_each(folder_path, pending, config,
+                                            processed_count, total_files)
             
+        for file_name, transcript in results:
             try:
-                print(f"Starting transcription for: {file_path}")
-                # Get transcription config
-                config = {
-                    'model': self.main_window.model_frame.model_var.get(),
-                    'speaker_labels': self.main_window.model_frame.speaker_var.get(),
-                    'chapters': self.main_window.model_frame.chapters_var.get(),
-                    'entity': self.main_window.model_frame.entity_var.get(),
-                    'keyphrases': self.main_window.model_frame.keyphrases_var.get(),
-                    'summary': self.main_window.model_frame.summary_var.get(),
-                    'timestamps': self.main_window.model_frame.timestamps_var.get()
-                }
-                print(f"Using config: {config}")
-                
-                # Transcribe file
-                transcript = self.current_service.transcribe(file_path, config)
+                if isinstance(transcript, Exception):
+                    raise transcript
                 print(f"Transcription completed successfully")
                 
                 # Save transcript
@@ -164,8 +172,9 @@ class TranscriptionApp:
                 self.main_window.progress_frame.add_file_result(file_name, "Success")
                 successful_files += 1
                 
-                # Refresh calendar view after successful transcription
-                self.main_window.calendar_view.load_files_from_folder(folder_path)
+                # Refresh calendar view after successful transcription, on
+                # the Tk thread
+                self.master.after(0, self.main_window.refresh_calendar, folder_path)
                 
             except Exception as e:
                 self.file_handler.skipped_files.append((file_name, str(e)))
@@ -191,13 +200,86 @@ class TranscriptionApp:
         self.main_window.audio_source_frame.folder_frame.start_button.config(state=tk.NORMAL)
         self.main_window.audio_source_frame.folder_frame.stop_button.config(state=tk.DISABLED)
         
+    def _transcribe_each(self, folder_path, file_names, config, done, total):
+        """Transcribe files one at a time until stopped, yielding
+        (file name, transcript or exception) pairs"""
+        for index, file_name in enumerate(file_names):
+            if self.stop_event.is_set():
+                self.main_window.progress_frame.status_var.set("Transcription stopped by user")
+                return
+            file_path = os.path.join(folder_path, file_name)
+            self.main_window.progress_frame.update_progress(file_name, done + index, total)
+            print(f"Starting transcription for: {file_path}")
+            try:
+                yield file_name, self.current_service.transcribe(file_path, config)
+            except Exception as e:
+                yield file_name, e
+                
+    def _transcribe_batch(self, folder_path, file_names, config, done, total):
+        """Transcribe files with all jobs in flight at once until stopped,
+        yielding (file name, transcript or exception) pairs as each finishes"""
+        if self.stop_event.is_set():
+            return
+        self.main_window.progress_frame.status_var.set(
+            f"Transcribing {len(file_names)} files...")
+        file_paths = [os.path.join(folder_path, name) for name in file_names]
+        
+        # The batch runs on its own thread and hands each result over, so
+        # transcripts are saved and progress shown as jobs complete
+        results = queue.Queue()
+        
+        def run():
+            try:
+                self.current_service.transcribe_many(
+                    file_paths, config,
+                    on_result=lambda index, result: results.put((index, result)),
+                    stop_event=self.stop_event)
+            except Exception as e:
+                results.put((None, e))
+            finally:
+                results.put(None)
+                
+        threading.Thread(target=run, daemon=True).start()
+        reported = set()
+        for index, result in iter(results.get, None):
+            if index is None:
+                # The batch failed as a whole; report every file still open
+                for i, file_name in enumerate(file_names):
+                    if i not in reported:
+                        yield file_name, result
+                continue
+            self.main_window.progress_frame.update_progress(
+                file_names[index], done + len(reported), total)
+            reported.add(index)
+            yield file_names[index], result
+            
     def stop_transcription(self):
         self.stop_event.set()
         
     def run(self):
         self.master.mainloop()
 
+def setup_logging(level=logging.INFO):
+    """Route log records through a queue so handlers run on a background thread"""
+    log_queue = queue.Queue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    return listener
+
 if __name__ == "__main__":
+    # Read .env once at startup; services only consult os.environ
+    load_dotenv()
+    log_listener = setup_logging()
     root = tk.Tk()
     app = TranscriptionApp(root)
-    app.run()
+    try:
+        app.run()
+    finally:
+        log_listener.stop()
@@ -4,13 +4,29 @@ import os
 from datetime import datetime
 import time
 import threading
+import subprocess
 import pyaudio
+from concurrent.futures import ThreadPoolExecutor
 from pydub import AudioSegment
 from utils.audio_recorder import AudioRecorder
+from utils.media_info import probe
 from services.assemblyai_realtime import AssemblyAIRealTimeTranscription
 from ui.components import DualPurposeIndicator
 from services.langchain_service import LangChainService
 
+# Media conversion runs here so imports never block the Tk main loop
+_IMPORT_EXEC = ThreadPoolExecutor(max_workers=2)
+
+# Audio codecs that can be extracted without re-encoding. Only MP3 is
+# copied: the library (file handler, calendar, batch) only lists .mp3 files
+_COPY_CODECS = {"mp3"}
+
+def _basename(path):
+    """Final component of a dialog path without full os.path parsing"""
+    # Tk dialogs return '/'-separated paths; Windows paths may also use os.sep
+    tail = path.rpartition('/')[2]
+    return tail.rpartition(os.sep)[2] if os.sep != '/' else tail
+
 class AudioSourceFrame(ttk.LabelFrame):
     def __init__(self, master, app):
         super().__init__(master, text="Audio Sources")
@@ -69,15 +85,19 @@ class SingleFileFrame(ttk.Frame):
         super().__init__(master)
         self.app = app
         
-        ttk.Button(
+        self.import_button = ttk.Button(
             self, 
             text="Import Audio/Video File",
             command=self.import_file
-        ).pack(pady=10)
+        )
+        self.import_button.pack(pady=10)
         
         self.file_label = ttk.Label(self, text="No file selected")
         self.file_label.pack(pady=5)
         
+        # Conversion progress, shown only while a video is being converted
+        self.progress = ttk.Progressbar(self, mode='determinate', maximum=100)
+        
         # Add control buttons
         self.button_frame = ttk.Frame(self)
         self.button_frame.pack(pady=5)
@@ -113,28 +133,67 @@ class SingleFileFrame(ttk.Frame):
                 self.process_audio_file(file_path)
                 
     def convert_to_mp3(self, video_path):
+        self.import_button.config(state=tk.DISABLED)
+        self.file_label.config(text=f"Converting {_basename(video_path)}...")
+        self.progress['value'] = 0
+        self.progress.pack(fill=tk.X, padx=5, pady=5, after=self.file_label)
+        
+        def on_progress(percent):
+            self.after(0, self.progress.configure, {'value': percent})
+            
+        future = _IMPORT_EXEC.submit(self._convert_file, video_path, on_progress)
+        future.add_done_callback(lambda f: self.after(0, self._on_convert_done, f))
+        
+    def _convert_file(self, video_path, on_progress=None):
+        """Extract the audio track into the imports folder on a worker thread"""
+        info = probe(video_path)
+        duration = float(info.get('format', {}).get('duration') or 0)
+        codec = next((stream.get('codec_name') for stream in info.get('streams', [])
+                      if stream.get('codec_type') == 'audio'), None)
+        
+        # MP3 tracks are copied out as-is; anything else is encoded to
+        # 16 kHz mono 128kbps MP3
+        if codec in _COPY_CODECS:
+            codec_args = ["-c:a", "copy"]
+        else:
+            codec_args = ["-ac", "1", "-ar", "16000", "-c:a", "libmp3lame", "-b:a", "128k"]
+        output_path = self.app.file_handler.generate_output_filename(
+            video_path, "mp3", "imports")
+            
+        # ffmpeg streams the file through its own pipeline, so the decoded
+        # audio is never held in memory; progress is reported on stdout
+        process = subprocess.Popen([
+            AudioSegment.converter, "-y", "-loglevel", "error",
+            "-i", video_path, "-vn", *codec_args,
+            "-progress", "pipe:1", "-nostats", output_path
+        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        
+        for line in process.stdout:
+            # out_time_ms is in microseconds despite its name
+            if on_progress and duration and line.startswith(b"out_time_ms="):
+                value = line[12:].strip()
+                if value.isdigit():
+                    on_progress(min(100.0, int(value) / 1e4 / duration))
+                    
+        errors = process.stderr.read().decode(errors='replace').strip()
+        if process.wait() != 0:
+            raise RuntimeError(errors or f"ffmpeg exited with code {process.returncode}")
+        return output_path
+        
+    def _on_convert_done(self, future):
+        """Back on the Tk thread: re-enable import and load the result"""
+        self.import_button.config(state=tk.NORMAL)
+        self.progress.pack_forget()
         try:
-            # Load video audio using pydub
-            audio = AudioSegment.from_file(video_path)
-            
-            # Generate output path in imports folder
-            output_path = self.app.file_handler.generate_output_filename(
-                video_path, "mp3", "imports")
-                
-            # Export as 128kbps MP3
-            audio.export(
-                output_path,
-                format="mp3",
-                bitrate="128k"
-            )
-            
-            self.process_audio_file(output_path)
-            
+            output_path = future.result()
         except Exception as e:
+            self.file_label.config(text="No file selected")
             messagebox.showerror("Conversion Error", str(e))
+            return
+        self.process_audio_file(output_path)
             
     def process_audio_file(self, file_path):
-        self.file_label.config(text=os.path.basename(file_path))
+        self.file_label.config(text=_basename(file_path))
         self.current_file = file_path  # Store selected file path
 
         
@@ -432,8 +491,13 @@ class SingleFileFrame(ttk.Frame):
             if hasattr(self, 'recorder'):
                 try:
                     print("Stopping audio recorder...")
-                    audio_data = self.recorder.stop()
-                    self.recorder = None  # Clear reference
+                    recorder, self.recorder = self.recorder, None  # Clear reference
+                    try:
+                        audio_data = recorder.encode_mp3(recorder.stop())
+                    finally:
+                        # A recorder is created per recording here, so its
+                        # PortAudio instance is released once encoded
+                        recorder.close()
                 except Exception as e:
                     print(f"Error stopping recorder: {e}")
             
@@ -672,8 +736,8 @@ class SingleFileFrame(ttk.Frame):
                             self.last_process_time = current_time
                     
                     # Update metadata
-                    if packet.get('speaker') and packet['speaker'] not in self.metadata['speakers']:
-                        self.metadata['speakers'].append(packet['speaker'])
+                    if packet.speaker and packet.speaker not in self.metadata['speakers']:
+                        self.metadata['speakers'].append(packet.speaker)
                         
             except Exception as e:
                 print(f"Transcription processing error: {e}")
@@ -687,8 +751,8 @@ class SingleFileFrame(ttk.Frame):
         seconds = int(current_time % 60)
         timestamp_str = f"[{minutes:02d}:{seconds:02d}]"
             
-        speaker = packet.get('speaker', 'Speaker 1')
-        text = packet.get('text', '')
+        speaker = packet.speaker or 'Speaker 1'
+        text = packet.text
         
         return f"{timestamp_str} {speaker}: {text}\n"
         
@@ -1,7 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from tkcalendar import Calendar
-from .media_player import MediaPlayerFrame
 from datetime import datetime
 import os
 import platform
@@ -467,7 +466,7 @@ class CalendarView(ttk.Frame):
                 if self.app.file_handler.check_transcript_exists(file_path):
                     transcript_path = os.path.splitext(file_path)[0] + '_transcript.txt'
                     self.app.main_window.media_player.load_transcript(transcript_path)
-                self.app.main_window.notebook.select(self.app.main_window.media_player)
+                self.app.main_window.notebook.select(self.app.main_window.media_player_tab)
                 
     def go_to_date(self):
         """Navigate to the date of the selected file"""
@@ -5,7 +5,6 @@ import os
 import platform
 import subprocess
 import numpy as np
-from dotenv import load_dotenv
 
 class DualPurposeIndicator(tk.Canvas):
     def __init__(self, master, size=60):
@@ -74,7 +73,6 @@ class DualPurposeIndicator(tk.Canvas):
 class APIKeyFrame(ttk.LabelFrame):
     def __init__(self, master):
         super().__init__(master, text="API Keys")
-        load_dotenv()
         
         # OpenAI API Key
         ttk.Label(self, text="OpenAI API Key:").pack(pady=5)
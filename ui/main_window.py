@@ -48,19 +48,58 @@ class MainWindow:
         self.recording_frame = RecordingFrame(self.notebook, self.app)
         self.notebook.add(self.recording_frame, text="Record")
         
-        # Calendar View
-        from .calendar_view import CalendarView
-        self.calendar_view = CalendarView(self.notebook, self.app)  # Pass app reference
-        self.notebook.add(self.calendar_view, text="Calendar View")
+        # Calendar and Media Player views are built into these placeholder
+        # tabs the first time they are shown or used, so their imports and
+        # widgets stay off the startup path
+        self.calendar_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.calendar_tab, text="Calendar View")
+        self.media_player_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.media_player_tab, text="Media Player")
+        self._calendar_view = None
+        self._media_player = None
+        self._lazy_tabs = {
+            str(self.calendar_tab): lambda: self.calendar_view,
+            str(self.media_player_tab): lambda: self.media_player,
+        }
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
         
-        # Media Player View
-        from .media_player import MediaPlayerFrame
-        self.media_player = MediaPlayerFrame(self.notebook)
-        self.notebook.add(self.media_player, text="Media Player")
+    @property
+    def calendar_view(self):
+        """Calendar view, created on first access"""
+        if self._calendar_view is None:
+            from .calendar_view import CalendarView
+            self._calendar_view = CalendarView(self.calendar_tab, self.app)  # Pass app reference
+            self._calendar_view.pack(fill=tk.BOTH, expand=True)
+        return self._calendar_view
+        
+    def refresh_calendar(self, folder_path):
+        """Reload the calendar's files if it has been built (Tk thread)
+        
+        A calendar that is not built yet reads the folder fresh when one
+        is selected, so it is not created just to be refreshed.
+        """
+        if self._calendar_view is not None:
+            self._calendar_view.load_files_from_folder(folder_path)
+            
+    @property
+    def media_player(self):
+        """Media player, created on first access"""
+        if self._media_player is None:
+            from .media_player import MediaPlayerFrame
+            self._media_player = MediaPlayerFrame(self.media_player_tab)
+            self._media_player.pack(fill=tk.BOTH, expand=True)
+        return self._media_player
+        
+    def _on_tab_changed(self, event):
+        """Build a lazy tab's contents on its first selection"""
+        build = self._lazy_tabs.pop(self.notebook.select(), None)
+        if build:
+            build()
         
     def on_closing(self):
         """Handle application closing"""
         # Stop any ongoing recording
         if hasattr(self, 'recording_frame'):
             self.recording_frame.stop_recording()
+            self.recording_frame.release_audio()
         self.master.destroy()
@@ -21,15 +21,20 @@ Usage:
 """
 
 import os
+import re
+import tempfile
+import wave
 import tkinter as tk
 from tkinter import ttk, messagebox
 import numpy as np
 from pydub import AudioSegment
 from pydub.generators import Sine
+from utils.media_info import probe_duration
 import pygame
 import threading
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
 
 # Configure logging
@@ -69,13 +74,69 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# Files are opened and probed here so loading never blocks the Tk main loop.
+# One worker keeps loads in order, so the newest load always finishes last.
+_LOAD_EXEC = ThreadPoolExecutor(max_workers=1)
+
+# Playback position is polled just after each whole second, when the time
+# display changes, and at least this often to notice the end of a track
+PLAYBACK_TICK_MS = 250
+PLAYBACK_TICK_SLACK_MS = 5
+
+# Formats pygame.mixer.music streams straight from disk; anything else is
+# decoded once to a temporary WAV on load
+STREAMABLE_TYPES = {'.mp3', '.wav', '.ogg', '.flac'}
+
+# Characters outside the BMP, which Tk indexes as two columns (UTF-16 units)
+_ASTRAL = re.compile('[\U00010000-\U0010FFFF]')
+
+def _tk_indices(text, line_starts, offsets, astral=True):
+    """Map code-point offsets into text to Tk "line.column" indices
+    
+    astral may be passed as False when text is known to be all BMP.
+    """
+    lines = np.searchsorted(line_starts, offsets, side='right')
+    starts = line_starts[lines - 1]
+    columns = (offsets - starts).tolist()
+    if astral and _ASTRAL.search(text):
+        # Count the line prefix in UTF-16 units, as Tk does
+        columns = [len(text[start:offset].encode('utf-16-le')) // 2
+                   for start, offset in zip(starts.tolist(), offsets.tolist())]
+    return [f"{line}.{column}" for line, column in zip(lines.tolist(), columns)]
+
+def _line_starts(text):
+    """Code-point offset at which each line of text starts"""
+    line_lengths = np.fromiter((len(line) + 1 for line in text.split('\n')), dtype=np.int64)
+    return np.concatenate(([0], np.cumsum(line_lengths[:-1])))
+
+def _match_indices(pattern, text, line_starts, astral=True):
+    """Tk indices of the start and end of every match of pattern in text"""
+    spans = [match.span() for match in pattern.finditer(text)]
+    if not spans:
+        return []
+    offsets = np.array(spans, dtype=np.int64).ravel()
+    return _tk_indices(text, line_starts, offsets, astral)
+
+def _read_duration(file_path):
+    """Duration in seconds, read from the header without decoding samples"""
+    if file_path.lower().endswith('.wav'):
+        # PCM WAV headers are parsed in-process instead of spawning ffprobe
+        try:
+            with wave.open(file_path, 'rb') as wf:
+                return wf.getnframes() / wf.getframerate()
+        except (wave.Error, EOFError):
+            pass  # e.g. float or compressed WAV; let ffprobe handle it
+    return probe_duration(file_path)
+
 class AudioPlayer:
     """Handles audio playback with proper resource management"""
     
     def __init__(self):
         self.logger = logging.getLogger('AudioPlayer')
         pygame.mixer.init()
-        self.audio_segment = None
+        self._source = None     # File pygame plays from
+        self._temp_path = None  # Decoded copy of a non-streamable file
+        self._mixer_source = None  # File currently opened in pygame's mixer
         self.duration = 0
         self._volume = 1.0
         self._position = 0
@@ -86,15 +147,14 @@ class AudioPlayer:
         self._playback_start_time = 0
         self._playback_start_position = 0
         
-    def _play_audio(self, audio_segment):
+    def _play_audio(self, source):
         """Play audio using pygame mixer"""
         try:
-            # Export to temporary file
-            temp_file = 'temp_playback.mp3'
-            audio_segment.export(temp_file, format='mp3')
-            
-            # Load and play with pygame
-            pygame.mixer.music.load(temp_file)
+            # pygame streams the file itself, so nothing is decoded up front;
+            # it stays open in the mixer across pause, resume and seek
+            if self._mixer_source != source:
+                pygame.mixer.music.load(source)
+                self._mixer_source = source
             pygame.mixer.music.play(start=self._position)
             pygame.mixer.music.set_volume(self._volume)
             
@@ -116,11 +176,20 @@ class AudioPlayer:
             self._state = new_state
 
     def load(self, file_path):
-        """Load an audio file using pydub."""
+        """Load an audio file, reading only its duration up front."""
         self.logger.info(f"Loading audio file: {file_path}")
         try:
-            self.audio_segment = AudioSegment.from_file(file_path)
-            self.duration = len(self.audio_segment) / 1000  # Convert to seconds
+            self._remove_temp()
+            self._source = None
+            self.duration = _read_duration(file_path)
+            if os.path.splitext(file_path)[1].lower() in STREAMABLE_TYPES:
+                self._source = file_path
+            else:
+                # pydub is only needed for containers pygame cannot open
+                fd, self._temp_path = tempfile.mkstemp(suffix='.wav')
+                os.close(fd)
+                AudioSegment.from_file(file_path).export(self._temp_path, format='wav')
+                self._source = self._temp_path
             self._state = PlaybackState.LOADED
             self._error_message = ""
             self.logger.info(f"Successfully loaded audio file. Duration: {self.duration}s")
@@ -129,13 +198,24 @@ class AudioPlayer:
             self._error_message = str(e)
             self.logger.error(f"Failed to load audio file: {str(e)}", exc_info=True)
             raise
+            
+    def _remove_temp(self):
+        """Delete the decoded copy of the previous file, if any"""
+        if self._temp_path:
+            try:
+                pygame.mixer.music.unload()
+                self._mixer_source = None
+                os.remove(self._temp_path)
+            except Exception as e:
+                self.logger.error(f"Temp file cleanup error: {e}")
+            self._temp_path = None
 
     def play(self):
         """Play or resume playback"""
         self.logger.debug(f"Play requested. Current state: {self._state}")
         
         with self._state_lock:
-            if self._state == PlaybackState.IDLE or not self.audio_segment:
+            if self._state == PlaybackState.IDLE or not self._source:
                 self.logger.warning("Cannot play: No audio loaded or player idle")
                 return False
                 
@@ -149,7 +229,7 @@ class AudioPlayer:
                 
             try:
                 with self._playback_lock:
-                    if self._play_audio(self.audio_segment):
+                    if self._play_audio(self._source):
                         self.logger.debug(f"Playback successfully started, state: {self._state}")
                         return True
                     else:
@@ -186,7 +266,7 @@ class AudioPlayer:
 
     def seek(self, position):
         """Seek to a specific position in seconds."""
-        if not self.audio_segment:
+        if not self._source:
             return False
             
         with self._state_lock:
@@ -200,16 +280,20 @@ class AudioPlayer:
                 was_playing = self._state == PlaybackState.PLAYING
                 
                 with self._playback_lock:
+                    if was_playing:
+                        # Restart the already-open stream at the new offset;
+                        # nothing is stopped, reopened or re-read
+                        pygame.mixer.music.play(start=new_position)
+                        self._position = new_position
+                        self._playback_start_position = new_position
+                        self._playback_start_time = time.time()
+                        return True
+                        
                     # Update position and cleanup
                     self._cleanup_playback()
                     self._position = new_position
                     self._playback_start_position = new_position
                     self._playback_start_time = time.time()
-                    
-                    # Resume if was playing
-                    if was_playing:
-                        return self.play()
-                    
                     self._state = PlaybackState.PAUSED
                     return True
                     
@@ -227,9 +311,6 @@ class AudioPlayer:
             
             try:
                 pygame.mixer.music.stop()
-                # Clean up temp file if it exists
-                if os.path.exists('temp_playback.mp3'):
-                    os.remove('temp_playback.mp3')
             except Exception as e:
                 self.logger.error(f"Cleanup error: {e}")
             
@@ -284,9 +365,8 @@ class AudioPlayer:
     def __del__(self):
         """Cleanup pygame mixer on deletion"""
         try:
+            self._remove_temp()
             pygame.mixer.quit()
-            if os.path.exists('temp_playback.mp3'):
-                os.remove('temp_playback.mp3')
         except:
             pass  # Suppress any errors during cleanup
 
@@ -295,12 +375,9 @@ class AudioPlayer:
         with self._state_lock:
             try:
                 self._volume = max(0.0, min(1.0, volume))
+                # Applied by the mixer as it plays; play() sets it again on start
                 if self._state == PlaybackState.PLAYING:
-                    with self._playback_lock:
-                        current_pos = self.get_position()
-                        self._cleanup_playback()
-                        self._position = current_pos
-                        return self.play()
+                    pygame.mixer.music.set_volume(self._volume)
                 return True
             except Exception as e:
                 self.logger.error(f"Volume error: {e}")
@@ -311,11 +388,18 @@ class MediaPlayerFrame(ttk.LabelFrame):
         super().__init__(master, text="Media Player")
         self.logger = logging.getLogger('MediaPlayerFrame')
         self.audio_player = AudioPlayer()
-        self.seek_update_time = 0
+        self._total_time_str = "00:00"  # Formatted once per loaded file
+        # Transcript text and its line start offsets, for mapping search
+        # matches to Text indices; rebuilt when the widget has been edited
+        self._search_text = ""
+        self._search_astral = False
+        self._line_starts = np.zeros(1, dtype=np.int64)
+        self._search_patterns = {}  # Search term -> compiled pattern
         self.duration = 0  # Initialize duration
         self.auto_play = tk.BooleanVar(value=False)  # Add auto-play option
-        self._update_lock = threading.Lock()
-        self._pending_updates = set()
+        self._tick_id = None  # Pending playback tick
+        self._last_whole_second = None
+        self._load_generation = 0  # Bumped per load so stale results are ignored
         
         # Filename display
         self.filename_var = tk.StringVar(value="No file loaded")
@@ -351,14 +435,17 @@ class MediaPlayerFrame(ttk.LabelFrame):
         self.time_label = ttk.Label(self.controls_frame, textvariable=self.time_var)
         self.time_label.pack(side=tk.RIGHT, padx=5)
         
+        # The slider has no command: display updates set its variable
+        # without seeking, and only a release of the mouse button seeks
+        self._slider_var = tk.DoubleVar(value=0)
+        self._slider_dragging = False
         self.position_slider = tk.Scale(self.controls_frame, from_=0, to=100,
                                       orient=tk.HORIZONTAL, showvalue=0,
-                                      command=self.seek_position)
+                                      variable=self._slider_var)
         self.position_slider.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         
         # Add drag tracking to slider
-        self.position_slider.bind('<Button-1>', lambda e: setattr(self.position_slider, '_dragging', True))
-        self.position_slider.bind('<ButtonRelease-1>', lambda e: setattr(self.position_slider, '_dragging', False))
+        self.position_slider.bind('<Button-1>', lambda e: setattr(self, '_slider_dragging', True))
         
         # Playback options frame
         self.options_frame = ttk.Frame(self.controls_frame)
@@ -424,10 +511,10 @@ class MediaPlayerFrame(ttk.LabelFrame):
         self.position_slider.bind('<ButtonRelease-1>', lambda e: self._slider_released())
         
     def _slider_released(self):
-        """Handle slider release event"""
-        self.position_slider._dragging = False
+        """Seek to where the user released the slider"""
+        self._slider_dragging = False
         if self.audio_file:
-            position = (float(self.position_slider.get()) / 100) * self.duration
+            position = (self._slider_var.get() / 100) * self.duration
             self.audio_player.seek(position)
 
         
@@ -453,34 +540,43 @@ class MediaPlayerFrame(ttk.LabelFrame):
             # Reset state
             self.audio_file = file_path
             self.filename_var.set("Loading...")
-            self.position_slider.set(0)
+            self._slider_var.set(0)
             self.time_var.set("00:00 / 00:00")
             
-            # Start async loading
-            self.master.after(50, self.load_audio_async, file_path)
+            # Load on the worker thread and apply the result back on Tk
+            self._load_generation += 1
+            generation = self._load_generation
+            future = _LOAD_EXEC.submit(self._load_job, file_path)
+            future.add_done_callback(
+                lambda f: self.after(0, self._on_load_done, generation, file_path, f))
             
         except Exception as e:
             self.filename_var.set(f"Error: {str(e)}")
             self.audio_file = None
-        
-    def load_audio_async(self, file_path):
-        """Load audio file asynchronously"""
-        try:
-            # Validate file type
-            ext = os.path.splitext(file_path)[1].lower()
-            supported_types = {'.mp3', '.wav', '.ogg', '.flac', '.m4a', '.wma'}
-            if ext not in supported_types:
-                raise ValueError(f"Unsupported file type. Supported: {', '.join(supported_types)}")
-            
-            self.audio_player.load(file_path)
-            self.duration = self.audio_player.duration
             
-            if self.duration <= 0:
-                raise ValueError("Invalid audio duration")
-                
+    def _load_job(self, file_path):
+        """Validate and open an audio file on the load worker thread"""
+        # Validate file type
+        ext = os.path.splitext(file_path)[1].lower()
+        supported_types = {'.mp3', '.wav', '.ogg', '.flac', '.m4a', '.wma'}
+        if ext not in supported_types:
+            raise ValueError(f"Unsupported file type. Supported: {', '.join(supported_types)}")
+            
+        self.audio_player.load(file_path)
+        if self.audio_player.duration <= 0:
+            raise ValueError("Invalid audio duration")
+        return self.audio_player.duration
+        
+    def _on_load_done(self, generation, file_path, future):
+        """Back on the Tk thread: show the loaded file unless a newer load started"""
+        if generation != self._load_generation:
+            return
+        try:
+            self.duration = future.result()
             self.filename_var.set(os.path.basename(file_path))
-            self.position_slider.set(0)
-            self.time_var.set(f"00:00 / {int(self.duration//60):02d}:{int(self.duration%60):02d}")
+            self._slider_var.set(0)
+            self._total_time_str = f"{int(self.duration//60):02d}:{int(self.duration%60):02d}"
+            self.time_var.set(f"00:00 / {self._total_time_str}")
             
         except Exception as e:
             self.filename_var.set(f"Error loading file: {str(e)}")
@@ -495,9 +591,18 @@ class MediaPlayerFrame(ttk.LabelFrame):
                 transcript_text = f.read()
             self.transcript_text.delete('1.0', tk.END)
             self.transcript_text.insert('1.0', transcript_text)
+            self._index_transcript(transcript_text)
         except Exception as e:
             print(f"Error loading transcript: {str(e)}")
             
+    def _index_transcript(self, text):
+        """Cache the transcript text and the offset at which each line starts"""
+        self._line_starts = _line_starts(text)
+        self._search_text = text
+        # Markers such as the recording flag are outside the BMP
+        self._search_astral = _ASTRAL.search(text) is not None
+        self.transcript_text.edit_modified(False)
+            
     def play_audio(self):
         """Toggle play/pause audio playback"""
         self.logger.info("Play audio requested")
@@ -546,25 +651,10 @@ class MediaPlayerFrame(ttk.LabelFrame):
             
         self.audio_player.stop()
         self.play_button.configure(text="Play")
-        self.position_slider.set(0)
+        self._slider_var.set(0)
         self.update_time_display()
         self.cancel_updates()
         
-    def seek_position(self, value):
-        """Handle seeking in audio"""
-        if not self.audio_file:
-            return
-            
-        now = time.time()
-        if now - self.seek_update_time > 0.1:  # 100ms throttle
-            try:
-                position = (float(value) / 100) * self.audio_player.duration
-                self.seek_update_time = now
-                self.audio_player.seek(position)
-            except Exception as e:
-                print(f"Seek error: {e}")
-            
-            
     def search_transcript(self):
         """Search within transcript"""
         search_term = self.search_var.get()
@@ -573,73 +663,73 @@ class MediaPlayerFrame(ttk.LabelFrame):
             
         # Remove previous search tags
         self.transcript_text.tag_remove('search', '1.0', tk.END)
-        
-        # Search and highlight matches
-        start_pos = '1.0'
-        while True:
-            start_pos = self.transcript_text.search(search_term, start_pos, tk.END)
-            if not start_pos:
-                break
-                
-            end_pos = f"{start_pos}+{len(search_term)}c"
-            self.transcript_text.tag_add('search', start_pos, end_pos)
-            start_pos = end_pos
+        if self.transcript_text.edit_modified():
+            self._index_transcript(self.transcript_text.get('1.0', 'end-1c'))
+            
+        pattern = self._search_patterns.get(search_term)
+        if pattern is None:
+            pattern = re.compile(re.escape(search_term), re.IGNORECASE)
+            self._search_patterns[search_term] = pattern
+            
+        # Find every match in one pass over the cached text, map the match
+        # offsets to line.column indices and highlight them in one call
+        indices = _match_indices(pattern, self._search_text, self._line_starts,
+                                 self._search_astral)
+        if indices:
+            self.transcript_text.tag_add('search', *indices)
             
         self.transcript_text.tag_config('search', background='yellow')
         
     def start_playback_updates(self):
-        """Start updating playback position"""
-        def update():
-            update_id = None
-            with self._update_lock:
-                if not self.audio_player:
-                    return
-                    
-                try:
-                    if self.audio_player.is_playing():
-                        position = self.audio_player.get_position()
-                        if position >= self.audio_player.duration:
-                            self.master.after_idle(self._on_playback_complete)
-                            # Check for auto-play
-                            if self.auto_play.get():
-                                self.master.after(1000, self.play_next)
-                            return
-                            
-                        # Update UI in main thread
-                        self.master.after_idle(lambda: self._update_ui(position))
-                        
-                        # Schedule next update if still playing
-                        if self.audio_player.is_playing():
-                            update_id = self.master.after(50, update)
-                            self._pending_updates.add(update_id)
-                    else:
-                        self.master.after_idle(self._on_playback_complete)
-                except Exception as e:
-                    self.logger.error(f"Update error: {e}")
-                    self.master.after_idle(self._on_playback_complete)
-                finally:
-                    if update_id:
-                        self._pending_updates.discard(update_id)
-                
+        """Start the playback tick that keeps the time display current"""
         self.cancel_updates()
-        initial_update_id = self.master.after(50, update)
-        self._pending_updates.add(initial_update_id)
+        self._last_whole_second = None
+        self._tick_id = self.after(PLAYBACK_TICK_MS, self._tick)
+        
+    def _tick(self):
+        """Follow playback on the Tk thread, redrawing only when the second changes"""
+        self._tick_id = None
+        if not self.audio_player:
+            return
+            
+        try:
+            if not self.audio_player.is_playing():
+                self._on_playback_complete()
+                return
+                
+            position = self.audio_player.get_position()
+            if position >= self.audio_player.duration:
+                self._on_playback_complete()
+                # Check for auto-play
+                if self.auto_play.get():
+                    self.after(1000, self.play_next)
+                return
+                
+            whole_second = int(position)
+            if whole_second != self._last_whole_second:
+                self._last_whole_second = whole_second
+                self.update_time_display(position)
+            until_next_second = 1000 - int(position * 1000) % 1000 + PLAYBACK_TICK_SLACK_MS
+            self._tick_id = self.after(min(PLAYBACK_TICK_MS, until_next_second), self._tick)
+        except Exception as e:
+            self.logger.error(f"Update error: {e}")
+            self._on_playback_complete()
 
-    def update_time_display(self):
+    def update_time_display(self, position=None):
         """Update time labels and slider"""
         if self.duration <= 0:
             self.time_var.set("00:00 / 00:00")
-            self.position_slider.set(0)
+            self._slider_var.set(0)
             return
         
-        position = self.audio_player.get_position()
+        if position is None:
+            position = self.audio_player.get_position()
         current_time = f"{int(position//60):02d}:{int(position%60):02d}"
-        total_time = f"{int(self.duration//60):02d}:{int(self.duration%60):02d}"
-        self.time_var.set(f"{current_time} / {total_time}")
+        self.time_var.set(f"{current_time} / {self._total_time_str}")
         
         # Only update slider if not being dragged
-        if not hasattr(self.position_slider, '_dragging'):
-            self.position_slider.set((position / self.duration) * 100)
+        if not self._slider_dragging:
+            self._slider_var.set((position / self.duration) * 100)
 
             
     def _on_playback_complete(self):
@@ -650,36 +740,21 @@ class MediaPlayerFrame(ttk.LabelFrame):
         self.cancel_updates()
         
         # Reset position to start
-        self.position_slider.set(0)
+        self._slider_var.set(0)
         self.audio_player._position = 0
         self.update_time_display()
         
         # Emit completion event
         self.event_generate('<<PlaybackComplete>>')
             
-    def _update_ui(self, position):
-        """Update UI elements with current position"""
-        if not self.audio_player:
-            return
-            
-        try:
-            self.update_time_display()
-            if self.duration > 0:
-                progress = (position / self.duration) * 100
-                if not hasattr(self.position_slider, '_dragging'):
-                    self.position_slider.set(progress)
-        except Exception as e:
-            self.logger.error(f"UI update error: {e}")
-            
     def cancel_updates(self):
-        """Cancel any pending updates"""
-        with self._update_lock:
-            for update_id in list(self._pending_updates):
-                try:
-                    self.after_cancel(update_id)
-                except Exception as e:
-                    self.logger.error(f"Error canceling update {update_id}: {e}")
-            self._pending_updates.clear()
+        """Cancel the pending playback tick"""
+        if self._tick_id is not None:
+            try:
+                self.after_cancel(self._tick_id)
+            except Exception as e:
+                self.logger.error(f"Error canceling update {self._tick_id}: {e}")
+            self._tick_id = None
 
     def set_volume(self, value):
         """Set audio volume"""
@@ -717,7 +792,7 @@ class MediaPlayerFrame(ttk.LabelFrame):
             if hasattr(self, 'time_var'):
                 self.time_var.set("00:00 / 00:00")
             if hasattr(self, 'position_slider'):
-                self.position_slider.set(0)
+                self._slider_var.set(0)
             
         except Exception as e:
             print(f"Cleanup error during destroy: {e}")
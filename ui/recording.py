@@ -2,15 +2,69 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import time
 import threading
+import queue
 import pyaudio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
+import logging
 from utils.audio_recorder import AudioRecorder
 from services.assemblyai_realtime import AssemblyAIRealTimeTranscription
 from ui.components import DualPurposeIndicator
 from services.langchain_service import LangChainService
 
+logger = logging.getLogger(__name__)
+
+# Recordings and transcripts are written here so stopping never blocks Tk
+_SAVE_EXEC = ThreadPoolExecutor(max_workers=1)
+
+# Chunk analyses run here so LLM calls never block the transcription worker.
+# One worker keeps chunks in order, since each uses the previous as context.
+_LLM_EXEC = ThreadPoolExecutor(max_workers=1)
+
+# The live transcript view keeps a rolling window of lines; the full
+# transcript lives in the side buffer that is saved on stop
+VIEW_MAX_LINES = 2000
+VIEW_TRIM_LINES = 500
+# Processing interval choices in seconds, in display order
+INTERVAL_SECONDS = {"Manual": float('inf'), "10s": 10, "45s": 45, "5m": 300, "10m": 600}
+
+# A chunk is also flushed at a pause: this much audio below the silence
+# level, once at least SILENCE_MIN_CHUNK_SECONDS have passed since the last
+SILENCE_LEVEL = 0.01
+SILENCE_FLUSH_MS = 700
+SILENCE_MIN_CHUNK_SECONDS = 5
+
+# Pending transcript lines are inserted (and scrolled to) at this cadence
+VIEW_REFRESH_MS = 100
+
+# Accumulated text is processed once it reaches this size (~2000 tokens)
+# whatever the interval, so a prompt never grows without bound
+ACCUMULATED_MAX_CHARS = 8000
+
+# "MM:SS" strings for the first three hours, so the timer and transcript
+# lines index a table instead of formatting a new string each time
+_MMSS = tuple(f"{m:02d}:{s:02d}" for m in range(180) for s in range(60))
+
+def _mmss(total_seconds):
+    """Format whole seconds as MM:SS"""
+    if total_seconds < len(_MMSS):
+        return _MMSS[total_seconds]
+    minutes, seconds = divmod(total_seconds, 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
 class RecordingFrame(ttk.Frame):
+    # Meeting template -> custom prompt text
+    _TEMPLATES = {
+        "Job Interview": "Help me during this interview by analyzing responses and suggesting improvements.",
+        "Technical Meeting": "Track technical terms and concepts discussed in the meeting.",
+        "Project Review": "Track action items, decisions, and key discussion points.",
+    }
+    
+    # Function keys that drop a transcript marker
+    _MARKER_KEYS = frozenset(f'F{i}' for i in range(1, 13))
+    
     def __init__(self, master, app):
         super().__init__(master)
         self.app = app
@@ -22,6 +76,29 @@ class RecordingFrame(ttk.Frame):
         # State variables for interval processing
         self.last_process_time = 0  # Tracks when we last processed text
         
+        # One transcription worker thread is started on the first recording
+        # and reused: _tx_wake hands it the next session, _stop_evt ends the
+        # current one and _worker_done is set once it has let go of it
+        self._tx_thread = None
+        self._tx_session = None
+        self._tx_wake = threading.Event()
+        self._stop_evt = threading.Event()
+        self._worker_done = threading.Event()
+        self._worker_done.set()
+        # Transcript file written line by line while recording
+        self._transcript_fp = None
+        self._transcript_path = None
+        self._recording_folder = None
+        # Speaker -> "] Speaker: " line infix, built once per speaker
+        self._speaker_cache = {}
+        
+        # Created on first recording and reused, so PortAudio is only
+        # initialized once per session
+        self._shared_recorder = None
+        
+        # Thread that streams captured audio to AssemblyAI
+        self._sender_thread = None
+        
         # Initialize LangChain service
         self.langchain_service = LangChainService()
         
@@ -42,8 +119,8 @@ class RecordingFrame(ttk.Frame):
         
         # Setup AI Insights in right frame
         self.setup_ai_insights(self.right_frame)
-        self.accumulated_text = ""   # Holds text between processing intervals
-        self.recent_frames = []      # Store recent audio frames for level monitoring
+        self.accumulated_text = deque()   # Text fragments between processing intervals
+        self._acc_chars = 0               # Approximate length of accumulated_text
         
         # Meeting Configuration Frame
         self.config_frame = ttk.LabelFrame(self, text="Meeting Configuration")
@@ -58,20 +135,18 @@ class RecordingFrame(ttk.Frame):
         self.interval_combo = ttk.Combobox(
             self.interval_frame,
             textvariable=self.interval_var,
-            values=["Manual", "10s", "45s", "5m", "10m"],
+            values=list(INTERVAL_SECONDS),
             width=12,
             state="readonly"
         )
         self.interval_combo.pack(side=tk.LEFT, padx=5)
         self.interval_combo.bind('<<ComboboxSelected>>', self.on_interval_change)
+        # Parsed once per selection rather than on every transcript packet
+        self._interval_seconds = INTERVAL_SECONDS[self.interval_var.get()]
         
         # Hotkey hint label
         ttk.Label(self.interval_frame, text="(F12 for instant process)").pack(side=tk.LEFT, padx=5)
         
-        # Bind F12 for instant processing
-        self.master.bind('<F12>', self.trigger_instant_processing)
-        self.bind_all('<F12>', self.trigger_instant_processing)  # Bind to all widgets
-        
         # Meeting Name
         ttk.Label(self.config_frame, text="Meeting Name:").pack(pady=2)
         self.meeting_name = ttk.Entry(self.config_frame)
@@ -108,6 +183,7 @@ class RecordingFrame(ttk.Frame):
         
         self.time_label = ttk.Label(self.controls_frame, text="00:00")
         self.time_label.pack(side=tk.LEFT, padx=5)
+        self._time_cfg = self.time_label.configure
         
         # Display Options
         self.display_frame = ttk.Frame(self.controls_frame)
@@ -140,6 +216,8 @@ class RecordingFrame(ttk.Frame):
                                      background='#f0f0f0',  # Light gray background
                                      font=('Courier', 9))   # Smaller font
         self.transcript_text.pack(fill=tk.BOTH, expand=True)
+        self._transcript_insert = self.transcript_text.insert
+        self._transcript_see = self.transcript_text.see
         self.transcript_scroll = ttk.Scrollbar(self.transcript_frame, 
                                              command=self.transcript_text.yview)
         self.transcript_scroll.pack(side=tk.RIGHT, fill=tk.Y)
@@ -184,14 +262,23 @@ class RecordingFrame(ttk.Frame):
         self.response_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.response_text.configure(yscrollcommand=self.response_scroll.set)
         
-        # Bind function keys
-        for i in range(1, 13):  # F1 through F12
-            self.master.bind(f'<F{i}>', self.add_marker)
+        # One binding for all function keys: F1-F12 add markers and F12
+        # also triggers instant processing. Bound on this window (added to,
+        # not replacing, its bindings) rather than on every widget in the app
+        self.winfo_toplevel().bind('<KeyPress>', self._dispatch_key, add='+')
 
+    def _dispatch_key(self, event):
+        """Route function key presses to their handlers"""
+        keysym = event.keysym
+        if keysym in self._MARKER_KEYS:
+            self.add_marker(event)
+            if keysym == 'F12':
+                self.trigger_instant_processing(event)
+                
     def add_marker(self, event):
         """Add a marker when function key is pressed"""
         if self.recording:
-            timestamp = time.time() - self.start_time
+            timestamp = time.monotonic() - self.start_time
             marker = {
                 'timestamp': timestamp,
                 'key': event.keysym,
@@ -201,23 +288,15 @@ class RecordingFrame(ttk.Frame):
             
             # Insert marker emoji
             self.transcript_text.insert(tk.INSERT, " 🚩 ")
+            self._write_transcript(" 🚩 ")
             self.transcript_text.see(tk.INSERT)
             
     def on_template_change(self, event):
         """Handle template selection"""
-        template = self.template_var.get()
-        if template == "Job Interview":
-            self.prompt_text.delete('1.0', tk.END)
-            self.prompt_text.insert('1.0', 
-                "Help me during this interview by analyzing responses and suggesting improvements.")
-        elif template == "Technical Meeting":
+        prompt = self._TEMPLATES.get(self.template_var.get())
+        if prompt:
             self.prompt_text.delete('1.0', tk.END)
-            self.prompt_text.insert('1.0',
-                "Track technical terms and concepts discussed in the meeting.")
-        elif template == "Project Review":
-            self.prompt_text.delete('1.0', tk.END)
-            self.prompt_text.insert('1.0',
-                "Track action items, decisions, and key discussion points.")
+            self.prompt_text.insert('1.0', prompt)
                 
     def refresh_display(self):
         """Refresh the transcript display with current settings"""
@@ -252,13 +331,15 @@ class RecordingFrame(ttk.Frame):
             self.assemblyai_session.start()
             
             # Initialize audio recorder with matching sample rate
-            self.recorder = AudioRecorder(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=16000,  # Match AssemblyAI's expected sample rate
-                chunk=1024,
-                mp3_bitrate='128k'
-            )
+            if self._shared_recorder is None:
+                self._shared_recorder = AudioRecorder(
+                    format=pyaudio.paInt16,
+                    channels=1,
+                    rate=16000,  # Match AssemblyAI's expected sample rate
+                    chunk=1600,  # 100 ms per callback
+                    mp3_bitrate='128k'
+                )
+            self.recorder = self._shared_recorder
             
             # Initialize metadata
             self.metadata = {
@@ -274,18 +355,52 @@ class RecordingFrame(ttk.Frame):
             self.transcribing = True
             self.markers = []
             self.record_btn.configure(text="Stop Recording")
-            self.start_time = time.time()
+            self.start_time = time.monotonic()
+            self._last_timer_text = None
             self.update_timer()
             
+            # The transcript is written to disk as it arrives (line buffered,
+            # so it survives a crash) rather than read out of the Text widget
+            # on stop; the recording is saved under the same name, in the
+            # folder chosen here even if the date changes while recording
+            self._recording_filename = f"{time.strftime('%y%m%d_%H%M')}_{self.meeting_name.get()}"
+            self._recording_folder = self.app.file_handler.get_dated_folder("recordings")
+            self._transcript_path = os.path.join(
+                self._recording_folder,
+                f"{self._recording_filename}_transcript.txt"
+            )
+            self._transcript_fp = open(self._transcript_path, 'w', encoding='utf-8', buffering=1)
+            
             # Clear displays
             self.transcript_text.delete('1.0', tk.END)
             self.response_text.delete('1.0', tk.END)
             
             # Start processing threads
+            self._ui_queue = queue.Queue()
+            self.after(VIEW_REFRESH_MS, self._drain_ui_queue)
+            # Bounded (~6 s of 100 ms chunks) so a stalled connection cannot
+            # grow memory; chunks are dropped and counted when it is full
+            self._audio_queue = queue.Queue(maxsize=64)
+            self.dropped_audio_chunks = 0
+            self.forced_flushes = 0
+            self._silence_ms = 0
+            self._sender_thread = threading.Thread(
+                target=self._send_audio,
+                args=(self._audio_queue, self.assemblyai_session),
+                daemon=True
+            )
+            self._sender_thread.start()
             self.recorder.start(callback=self.process_audio_chunk)
-            threading.Thread(target=self.process_transcriptions, daemon=True).start()
+            self._tx_session = self.assemblyai_session
+            self._stop_evt.clear()
+            self._worker_done.clear()
+            self._tx_wake.set()
+            if self._tx_thread is None:
+                self._tx_thread = threading.Thread(target=self._transcription_worker, daemon=True)
+                self._tx_thread.start()
             
             # Start indicator updates
+            self._indicator_state = None
             self.update_dual_indicator()
             
         except Exception as e:
@@ -295,21 +410,39 @@ class RecordingFrame(ttk.Frame):
     def process_audio_chunk(self, audio_chunk):
         """Process audio chunks for live transcription"""
         if self.transcribing:
+            # Hand off to the sender thread so the audio callback never
+            # waits on network I/O
+            try:
+                self._audio_queue.put_nowait(audio_chunk)
+            except queue.Full:
+                self.dropped_audio_chunks += 1
+            
+            # Track the current pause and flush once when it gets long enough
+            if self.recorder.frame_level < SILENCE_LEVEL:
+                silence_ms = self._silence_ms + len(audio_chunk) * 1000 // (2 * 16000)
+                if self._silence_ms < SILENCE_FLUSH_MS <= silence_ms:
+                    self.master.after(0, self._flush_on_silence)
+                self._silence_ms = silence_ms
+            else:
+                self._silence_ms = 0
+            
+    def _send_audio(self, audio_queue, session):
+        """Stream queued audio chunks to AssemblyAI until a None sentinel"""
+        while True:
+            audio_chunk = audio_queue.get()
+            if audio_chunk is None:
+                break
             try:
-                self.assemblyai_session.process_audio_chunk(audio_chunk)
-                # Keep last 10 frames for level monitoring
-                self.recent_frames.append(audio_chunk)
-                if len(self.recent_frames) > 10:
-                    self.recent_frames.pop(0)
+                session.process_audio_chunk(audio_chunk)
             except Exception as e:
-                print(f"Transcription error: {e}")
+                logger.error("Transcription error: %s", e)
         
     def stop_recording(self):
         """Stop recording and cleanup resources"""
         if not hasattr(self, 'recorder') and not hasattr(self, 'assemblyai_session'):
             return  # Nothing to stop
             
-        audio_data = None
+        recorder = audio_frames = None
         try:
             # Disable UI elements and set flags first
             self.record_btn.configure(state=tk.DISABLED)
@@ -319,14 +452,38 @@ class RecordingFrame(ttk.Frame):
             self.transcribing = False
             self.recording = False
             
+            # Wait for the transcription worker to let go of the session
+            # before tearing it down
+            self._stop_evt.set()
+            if not self._worker_done.is_set():
+                self._tx_session.interrupt()
+                self._worker_done.wait(timeout=2.0)
+                self._flush_ui_queue()
+            self._tx_session = None
+            
             # Stop audio recorder and get final data
             if hasattr(self, 'recorder'):
                 try:
                     print("Stopping audio recorder...")
-                    audio_data = self.recorder.stop()
+                    # Only the raw frames are taken here; MP3 encoding
+                    # happens in the save job
+                    recorder = self.recorder
+                    audio_frames = recorder.stop()
                     self.recorder = None  # Clear reference
                 except Exception as e:
                     print(f"Error stopping recorder: {e}")
+                    
+            # Let the sender thread stream what is left before closing
+            if self._sender_thread is not None:
+                try:
+                    self._audio_queue.put(None, timeout=2.0)
+                    self._sender_thread.join(timeout=2.0)
+                except queue.Full:
+                    logger.warning("Audio sender did not drain its queue")
+                self._sender_thread = None
+                if self.dropped_audio_chunks:
+                    logger.warning("Dropped %d audio chunks while the transcription "
+                                   "connection was stalled", self.dropped_audio_chunks)
             
             # Stop AssemblyAI session
             if hasattr(self, 'assemblyai_session'):
@@ -337,11 +494,8 @@ class RecordingFrame(ttk.Frame):
                 except Exception as e:
                     print(f"Error stopping AssemblyAI: {e}")
             
-            # Clear any remaining audio data
-            self.recent_frames.clear()
-            
             # Save recording if we have audio data
-            if audio_data and hasattr(self, 'metadata'):
+            if audio_frames and hasattr(self, 'metadata'):
                 try:
                     # Update metadata with markers
                     self.metadata["hotkey_markers"] = [
@@ -351,23 +505,14 @@ class RecordingFrame(ttk.Frame):
                         } for m in self.markers
                     ]
                     
-                    # Save recording
-                    current_time = datetime.now()
-                    filename = f"{current_time.strftime('%y%m%d_%H%M')}_{self.meeting_name.get()}"
-                    saved_path = self.app.file_handler.save_recording(
-                        audio_data, 
-                        filename,
-                        metadata=self.metadata
-                    )
-                    
-                    # Save transcript
-                    full_transcript = self.transcript_text.get('1.0', tk.END)
-                    transcript_path = os.path.splitext(saved_path)[0] + '_transcript.txt'
-                    with open(transcript_path, 'w', encoding='utf-8') as f:
-                        f.write(full_transcript)
-                    
-                    self.transcript_text.insert('end', f"\n\nTranscript saved: {transcript_path}")
-                    self.transcript_text.insert('end', f"\nRecording saved: {saved_path}")
+                    # Save recording in the background
+                    self.transcript_text.insert('end', "\n\nSaving recording...")
+                    transcript_path = self._transcript_path
+                    future = _SAVE_EXEC.submit(self._save_job, recorder, audio_frames,
+                                               self._recording_filename, self._recording_folder,
+                                               self.metadata)
+                    future.add_done_callback(
+                        lambda f: self.after(0, self._on_save_done, f, transcript_path))
                     
                 except Exception as e:
                     print(f"Error saving recording/transcript: {e}")
@@ -379,7 +524,10 @@ class RecordingFrame(ttk.Frame):
             
         finally:
             # Clean up remaining resources
-            self.accumulated_text = ""
+            if self._transcript_fp is not None:
+                self._transcript_fp.close()
+                self._transcript_fp = None
+            self.accumulated_text.clear()
             self.markers.clear()
             self.metadata = None
             
@@ -390,13 +538,40 @@ class RecordingFrame(ttk.Frame):
             )
             self.update()
         
+    def _save_job(self, recorder, audio_frames, filename, folder, metadata):
+        """Encode and write the recording and metadata on a worker thread"""
+        audio_data = recorder.encode_mp3(audio_frames)
+        saved_path = self.app.file_handler.save_recording(
+            audio_data, 
+            filename,
+            metadata=metadata,
+            folder=folder
+        )
+        if saved_path is None:
+            raise IOError("Recording could not be written")
+        return saved_path
+        
+    def _on_save_done(self, future, transcript_path):
+        """Back on the Tk thread: report where the files were saved"""
+        try:
+            saved_path = future.result()
+        except Exception as e:
+            logger.error("Error saving recording/transcript: %s", e)
+            self.transcript_text.insert('end', f"\n\nError saving files: {str(e)}")
+            return
+        self.transcript_text.insert('end', f"\n\nTranscript saved: {transcript_path}")
+        self.transcript_text.insert('end', f"\nRecording saved: {saved_path}")
+        
     def update_timer(self):
         if self.recording:
-            elapsed = int(time.time() - self.start_time)
-            minutes = elapsed // 60
-            seconds = elapsed % 60
-            self.time_label.configure(text=f"{minutes:02d}:{seconds:02d}")
-            self.after(1000, self.update_timer)
+            elapsed = time.monotonic() - self.start_time
+            text = _mmss(int(elapsed))
+            if text != self._last_timer_text:
+                self._time_cfg(text=text)
+                self._last_timer_text = text
+            # Aim the next tick at the next whole second so the display
+            # does not drift behind the recording clock
+            self.after(max(1, 1000 - int(elapsed * 1000) % 1000), self.update_timer)
             
     def _stop_assemblyai_session(self):
         """Deprecated: Now handled directly in stop_recording"""
@@ -406,9 +581,9 @@ class RecordingFrame(ttk.Frame):
         """Update the dual-purpose indicator during recording"""
         if self.recording:
             # Calculate chunk progress
-            interval = self.get_current_interval()
+            interval = self._interval_seconds
             if interval != float('inf'):
-                elapsed = time.time() - self.last_process_time
+                elapsed = time.monotonic() - self.last_process_time
                 # Ensure progress doesn't exceed 100%
                 chunk_progress = min((elapsed / interval) * 100, 100)
                 # Calculate actual seconds remaining
@@ -418,53 +593,54 @@ class RecordingFrame(ttk.Frame):
                 seconds_remaining = 0
             
             # Get audio level
-            audio_level = self.recorder.get_audio_level() * 100 if hasattr(self, 'recorder') else 0
+            audio_level = self.get_audio_level() * 100
             
-            # Update the indicator with actual seconds remaining
-            self.dual_indicator.update(chunk_progress, audio_level, seconds_remaining)
+            # Update the indicator with actual seconds remaining, but only
+            # redraw when it is on screen and something visible changed
+            state = (int(chunk_progress), int(audio_level), int(seconds_remaining))
+            if state != self._indicator_state and self.dual_indicator.winfo_viewable():
+                self.dual_indicator.update(chunk_progress, audio_level, seconds_remaining)
+                self._indicator_state = state
             
-            # Schedule next update
-            self.after(50, self.update_dual_indicator)
+            # Schedule next update (10 Hz is plenty for a level meter)
+            self.after(100, self.update_dual_indicator)
             
+    def get_audio_level(self):
+        """Get the RMS level (0-1) of the recent audio frames"""
+        recorder = getattr(self, 'recorder', None)
+        return recorder.get_audio_level() if recorder else 0.0
+        
     def get_current_interval(self):
-        """Convert interval string to seconds"""
-        interval = self.interval_var.get()
-        if interval == "Manual":
-            return float('inf')
-        # Convert time formats to seconds
-        value = interval[:-1]  # Remove last character
-        unit = interval[-1]    # Get last character
-        try:
-            value = int(value)
-            if unit == 's':
-                return value
-            elif unit == 'm':
-                return value * 60
-            else:
-                return float('inf')
-        except ValueError:
-            return float('inf')
+        """Get the selected processing interval in seconds"""
+        return self._interval_seconds
         
     def on_interval_change(self, event=None):
         """Handle interval change and process if needed"""
-        new_interval = self.get_current_interval()
-        current_time = time.time()
+        new_interval = self._interval_seconds = INTERVAL_SECONDS.get(
+            self.interval_var.get(), float('inf'))
+        current_time = time.monotonic()
         time_since_last = current_time - self.last_process_time
         
         # If we've accumulated more time than the new interval, process immediately
         if time_since_last >= new_interval and self.accumulated_text:
-            self.process_text_chunk(self.accumulated_text)
-            self.accumulated_text = ""
+            self.process_text_chunk(self._take_accumulated_text())
             self.last_process_time = current_time
         
+    def _flush_on_silence(self):
+        """Process the accumulated text at a pause in speech"""
+        if not self.recording or self._interval_seconds == float('inf'):
+            return  # Manual mode only flushes on request
+        current_time = time.monotonic()
+        if (current_time - self.last_process_time >= SILENCE_MIN_CHUNK_SECONDS
+                and self.accumulated_text):
+            self.process_text_chunk(self._take_accumulated_text())
+            self.last_process_time = current_time
+            
     def trigger_instant_processing(self, event=None):
         """Handle F12 key press for instant processing"""
         if not self.recording:
             return
             
-        if not hasattr(self, 'accumulated_text'):
-            return
-            
         # Flash the indicator to show chunk processing
         self.dual_indicator.create_oval(5, 5, self.dual_indicator.size-5, 
                                       self.dual_indicator.size-5, 
@@ -472,35 +648,49 @@ class RecordingFrame(ttk.Frame):
         self.after(100, lambda: self.dual_indicator.delete("flash"))
             
         # Force immediate processing
-        current_time = time.time()
-        text_to_process = self.accumulated_text.strip()
+        current_time = time.monotonic()
+        text_to_process = self._take_accumulated_text().strip()
         
         if text_to_process:
-            print(f"Processing chunk: {text_to_process}")  # Debug print
             self.process_text_chunk(text_to_process)
-            self.accumulated_text = ""
             self.last_process_time = current_time
             
             # Reset the visual indicator
-            audio_level = self.recorder.get_audio_level() * 100 if hasattr(self, 'recorder') else 0
+            audio_level = self.get_audio_level() * 100
             self.dual_indicator.update(0, audio_level, self.get_current_interval())
             
             # Force UI update
             self.update()
-        else:
-            print("No text to process")  # Debug print
             
     def process_text_chunk(self, text):
-        """Process accumulated text chunk using LangChain service"""
+        """Process accumulated text chunk using LangChain service
+        
+        Safe to call from any thread: widget updates are posted to the Tk
+        thread and the LLM call runs on the analysis executor.
+        """
         if not text or not text.strip():
-            print("Empty text chunk, skipping processing")
+            logger.debug("Empty text chunk, skipping processing")
             return
             
-        current_time = datetime.now().strftime('%H:%M:%S')
-        elapsed_since_last = time.time() - self.last_process_time
-        # Ensure there's a newline before starting a new chunk
-        current_text = self.transcript_text.get("1.0", tk.END)
-        if not current_text.endswith('\n\n'):
+        current_time = time.strftime('%H:%M:%S')
+        elapsed_since_last = time.monotonic() - self.last_process_time
+        self.master.after(0, self._render_chunk, current_time, elapsed_since_last, text)
+        
+        template = {
+            "name": self.template_var.get(),
+            "system": "You are an AI assistant analyzing meeting transcripts in real-time. Focus on key points and be concise.",
+            "user": "Analyze this segment and provide:\n1. Key Points\n2. Action Items\n3. Decisions Made"
+        }
+        _LLM_EXEC.submit(self._analyze_chunk, text, template, current_time)
+        
+    def _render_chunk(self, current_time, elapsed_since_last, text):
+        """Add a chunk header and its text to the transcript (Tk thread)"""
+        # Lines queued before this chunk was taken go in first
+        self._flush_ui_queue()
+        
+        # Ensure there's a newline before starting a new chunk; only the last
+        # two characters are read (end-1c skips Tk's trailing newline)
+        if self.transcript_text.get('end-3c', 'end-1c') != '\n\n':
             chunk_header = (
                 f"\n\n=== New Chunk ({current_time}) ===\n"
                 f"Time since last chunk: {elapsed_since_last:.1f}s\n"
@@ -510,86 +700,154 @@ class RecordingFrame(ttk.Frame):
                 f"=== New Chunk ({current_time}) ===\n"
                 f"Time since last chunk: {elapsed_since_last:.1f}s\n"
             )
+            
+        self.transcript_text.insert(tk.END, chunk_header)
+        self.transcript_text.insert(tk.END, text)
+        self.transcript_text.see(tk.END)
+        self._write_transcript(chunk_header)
+        self._write_transcript(text)
         
+    def _analyze_chunk(self, text, template, current_time):
+        """Run the LangChain analysis on the executor and post the result"""
         try:
-            # Add chunk header and text
-            self.transcript_text.insert(tk.END, chunk_header)
-            self.transcript_text.insert(tk.END, text)
-            self.transcript_text.see(tk.END)
-            
-            # Process with LangChain
-            template = {
-                "name": self.template_var.get(),
-                "system": "You are an AI assistant analyzing meeting transcripts in real-time. Focus on key points and be concise.",
-                "user": "Analyze this segment and provide:\n1. Key Points\n2. Action Items\n3. Decisions Made"
-            }
-            
             result = self.langchain_service.process_chunk(text, template)
-            
-            # Update AI Insights
-            self.insights_text.insert(tk.END, f"\n--- Analysis [{current_time}] ---\n{result}\n")
-            self.insights_text.see(tk.END)
-            
-            print(f"Processed chunk at {current_time}")  # Debug print
+            self.master.after(0, self._render_analysis, current_time, result)
         except Exception as e:
-            print(f"Error processing text chunk: {e}")  # Debug print
-            
-    def process_transcriptions(self):
+            logger.error("Error processing text chunk: %s", e)
+            
+    def _render_analysis(self, current_time, result):
+        """Update AI Insights with a chunk analysis (Tk thread)"""
+        self.insights_text.insert(tk.END, f"\n--- Analysis [{current_time}] ---\n{result}\n")
+        self.insights_text.see(tk.END)
+        
+    def _transcription_worker(self):
+        """Run process_transcriptions for each recording session in turn"""
+        while True:
+            self._tx_wake.wait()
+            self._tx_wake.clear()
+            try:
+                self.process_transcriptions(self._tx_session)
+            except Exception as e:
+                logger.error("Transcription worker error: %s", e)
+                
+    def process_transcriptions(self, session):
         """Process incoming transcriptions with interval-based chunking"""
-        self.last_process_time = time.time()
-        self.accumulated_text = ""
+        self.last_process_time = time.monotonic()
+        self.accumulated_text.clear()
+        self._acc_chars = 0
 
-        while self.recording and hasattr(self, 'assemblyai_session'):
-            try:
-                packet = self.assemblyai_session.get_next_transcription()
-                if packet:
-                    formatted_transcript = self.format_transcript(packet)
-                    self.master.after(0, self.update_transcript_display, formatted_transcript)
-                    
-                    # Accumulate text
-                    self.accumulated_text += formatted_transcript
-                    
-                    current_time = time.time()
-                    interval = self.get_current_interval()
-                    
-                    # Process if interval has elapsed or we're in instant mode
-                    if interval != float('inf'):
-                        time_since_last = current_time - self.last_process_time
-                        if time_since_last >= interval and self.accumulated_text.strip():
-                            self.process_text_chunk(self.accumulated_text)
-                            self.accumulated_text = ""
+        try:
+            while not self._stop_evt.is_set():
+                try:
+                    # Blocks until a result arrives (or stop interrupts it)
+                    packet = session.get_next_transcription(timeout=1.0)
+                    if packet:
+                        current_time = time.monotonic()
+                        formatted_transcript = self.format_transcript(packet, current_time)
+                        self._ui_queue.put(formatted_transcript)
+                        
+                        # Accumulate text
+                        self.accumulated_text.append(formatted_transcript)
+                        self._acc_chars += len(formatted_transcript)
+                        
+                        interval = self.get_current_interval()
+                        
+                        # Process if the text has grown too large (even in
+                        # Manual mode) or the interval has elapsed
+                        if self._acc_chars >= ACCUMULATED_MAX_CHARS:
+                            self.forced_flushes += 1
+                            logger.info("Accumulated text reached %d chars, processing "
+                                        "early (forced flush %d)",
+                                        self._acc_chars, self.forced_flushes)
+                            self.process_text_chunk(self._take_accumulated_text())
                             self.last_process_time = current_time
-                    
-                    # Update metadata
-                    if packet.get('speaker') and packet['speaker'] not in self.metadata['speakers']:
-                        self.metadata['speakers'].append(packet['speaker'])
+                        elif interval != float('inf'):
+                            time_since_last = current_time - self.last_process_time
+                            if time_since_last >= interval and self.accumulated_text:
+                                self.process_text_chunk(self._take_accumulated_text())
+                                self.last_process_time = current_time
                         
-            except Exception as e:
-                print(f"Transcription processing error: {e}")
-                time.sleep(0.1)
+                        # Update metadata
+                        if packet.speaker and packet.speaker not in self.metadata['speakers']:
+                            self.metadata['speakers'].append(packet.speaker)
+                            
+                except Exception as e:
+                    print(f"Transcription processing error: {e}")
+                    # Back off briefly, but wake at once if stopped
+                    self._stop_evt.wait(0.1)
+        finally:
+            self._worker_done.set()
                 
-    def format_transcript(self, packet):
+    def _take_accumulated_text(self):
+        """Join and remove the accumulated fragments"""
+        self._acc_chars = 0
+        # popleft is atomic, so fragments appended by the worker thread while
+        # draining are either taken now or left for the next chunk
+        parts = []
+        try:
+            while True:
+                parts.append(self.accumulated_text.popleft())
+        except IndexError:
+            pass
+        return "".join(parts)
+        
+    def format_transcript(self, packet, now=None):
         """Format transcript with timestamp and speaker"""
         # Use recording start time to calculate relative timestamp
-        current_time = time.time() - self.start_time
-        minutes = int(current_time // 60)
-        seconds = int(current_time % 60)
-        timestamp_str = f"[{minutes:02d}:{seconds:02d}]"
+        if now is None:
+            now = time.monotonic()
+        speaker = packet.speaker
+        infix = self._speaker_cache.get(speaker)
+        if infix is None:
+            infix = self._speaker_cache[speaker] = f"] {speaker or 'Speaker 1'}: "
+        return "[" + _mmss(int(now - self.start_time)) + infix + packet.text + "\n"
+        
+    def _drain_ui_queue(self):
+        """Insert pending transcript lines every VIEW_REFRESH_MS while recording"""
+        self._flush_ui_queue()
+        if self.recording:
+            self.after(VIEW_REFRESH_MS, self._drain_ui_queue)
+            
+    def _flush_ui_queue(self):
+        """Insert all pending transcript lines in one Text update"""
+        parts = []
+        try:
+            while True:
+                parts.append(self._ui_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if parts:
+            self.update_transcript_display("".join(parts))
+            self._trim_transcript_view()
+            
+    def _trim_transcript_view(self):
+        """Drop the oldest lines once the view grows past VIEW_MAX_LINES"""
+        lines = int(self.transcript_text.index('end-1c').split('.')[0])
+        if lines > VIEW_MAX_LINES:
+            self.transcript_text.delete('1.0', f'{VIEW_TRIM_LINES + 1}.0')
             
-        speaker = packet.get('speaker', 'Speaker 1')
-        text = packet.get('text', '')
-        
-        return f"{timestamp_str} {speaker}: {text}\n"
-        
     def update_transcript_display(self, text):
         """Update transcript display with new text"""
         # Add new text without any tags (plain formatting)
-        self.transcript_text.insert(tk.END, text)
-        self.transcript_text.see(tk.END)
+        self._transcript_insert(tk.END, text)
+        self._transcript_see(tk.END)
+        self._write_transcript(text)
+        
+    def _write_transcript(self, text):
+        """Append text to the transcript file of the current recording"""
+        if self._transcript_fp is not None:
+            self._transcript_fp.write(text)
         
     def copy_to_clipboard(self, text_widget):
         """Copy text widget contents to clipboard"""
-        content = text_widget.get('1.0', tk.END).strip()
+        # The transcript view only holds recent lines; copy the full record
+        if text_widget is self.transcript_text and self._transcript_path:
+            if self._transcript_fp is not None:
+                self._transcript_fp.flush()
+            with open(self._transcript_path, encoding='utf-8') as f:
+                content = f.read().strip()
+        else:
+            content = text_widget.get('1.0', tk.END).strip()
         self.clipboard_clear()
         self.clipboard_append(content)
         self.update()  # Required for clipboard to work
@@ -598,7 +856,14 @@ class RecordingFrame(ttk.Frame):
         """Handle window closing"""
         if self.recording:
             self.stop_recording()
+        self.release_audio()
         self.master.destroy()
+        
+    def release_audio(self):
+        """Release the shared audio recorder"""
+        if self._shared_recorder is not None:
+            self._shared_recorder.close()
+            self._shared_recorder = None
 
     def setup_recording_controls(self, frame):
         """Setup recording controls and transcript area"""
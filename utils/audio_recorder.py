@@ -1,17 +1,25 @@
 import pyaudio
 import wave
 import io
+import math
+from collections import deque
 from pydub import AudioSegment
-import threading
 import time
 import numpy as np
-from typing import Optional, Callable
+from typing import Optional, Callable, List
 
 class AudioRecorder:
     """Handles real-time audio recording with MP3 conversion"""
     
     def __init__(self, format=pyaudio.paInt16, channels=1, rate=44100, chunk=1024, mp3_bitrate='128k'):
-        self.recent_frames = []  # Keep recent frames for level monitoring
+        # (sum of squares, sample count) of the last 10 frames plus running
+        # totals, so the level meter never has to revisit samples
+        self.recent_frames = deque(maxlen=10)
+        self._level_totals = (0.0, 0)
+        self.frame_level = 0.0  # RMS (0-1) of the most recent frame
+        # Float scratch buffer for the level calculation, allocated once so
+        # the audio callback does not allocate per frame
+        self._level_buf = np.empty(chunk * channels, dtype=np.float32)
         self.format = format
         self.channels = channels
         self.rate = rate
@@ -22,62 +30,89 @@ class AudioRecorder:
         self.is_recording = False
         self.audio = pyaudio.PyAudio()
         self._stream = None
-        self._thread: Optional[threading.Thread] = None
+        self._callback: Optional[Callable] = None
         
     def start(self, callback: Optional[Callable] = None):
         """Start recording audio"""
+        self.frames = []
+        self.recent_frames.clear()
+        self._level_totals = (0.0, 0)
+        self._callback = callback
         self.is_recording = True
+        # PortAudio calls back with each filled buffer on its own thread,
+        # so no Python thread sits in a blocking read loop
         self._stream = self.audio.open(
             format=self.format,
             channels=self.channels,
             rate=self.rate,
             input=True,
-            frames_per_buffer=self.chunk
+            frames_per_buffer=self.chunk,
+            stream_callback=self._on_audio
         )
         
-        def record():
-            while self.is_recording:
-                data = self._stream.read(self.chunk)
-                self.frames.append(data)
-                if callback:
-                    callback(data)
-                    
-        self._thread = threading.Thread(target=record)
-        self._thread.start()
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """PortAudio stream callback"""
+        self.frames.append(in_data)
+        self._track_level(in_data)
+        if self._callback:
+            self._callback(in_data)
+        return (None, pyaudio.paContinue)
+        
+    def _track_level(self, data: bytes):
+        """Fold one frame into the running sum of squares"""
+        samples = np.frombuffer(data, dtype=np.int16)  # a view, not a copy
+        n = len(samples)
+        if n > len(self._level_buf):
+            self._level_buf = np.empty(n, dtype=np.float32)
+        scratch = self._level_buf[:n]
+        np.copyto(scratch, samples, casting='unsafe')
+        energy = float(np.dot(scratch, scratch))
+        if n:
+            self.frame_level = math.sqrt(energy / n) / 32768.0
+        sum_squares, count = self._level_totals
+        if len(self.recent_frames) == self.recent_frames.maxlen:
+            old_energy, old_count = self.recent_frames[0]
+            sum_squares -= old_energy
+            count -= old_count
+        self.recent_frames.append((energy, n))
+        # Published as one tuple so readers never see a half-updated pair
+        self._level_totals = (sum_squares + energy, count + n)
         
     def get_audio_level(self) -> float:
         """Get current audio level (RMS)"""
-        if not self.recent_frames:
-            return 0.0
-        try:
-            # Convert recent audio data to numpy array
-            audio_data = np.frombuffer(b''.join(self.recent_frames), dtype=np.int16)
-            # Calculate RMS
-            rms = np.sqrt(np.mean(np.square(audio_data)))
-            # Normalize to 0-1
-            return min(1.0, rms / 32767)
-        except:
+        sum_squares, count = self._level_totals
+        if not count:
             return 0.0
+        # Normalize to 0-1
+        return min(1.0, math.sqrt(max(sum_squares, 0.0) / count) / 32768.0)
 
-    def stop(self) -> bytes:
-        """Stop recording and return MP3 data"""
+    def stop(self) -> List[bytes]:
+        """Stop recording and return the recorded PCM frames
+        
+        Encoding is left to encode_mp3 so callers can run it off the UI thread.
+        """
         self.is_recording = False
-        if self._thread:
-            self._thread.join()
-            
-        if self._stream:
-            self._stream.stop_stream()
-            self._stream.close()
+        # Nothing was recorded if no stream was started since the last stop
+        if self._stream is None:
+            return []
+        self._stream.stop_stream()
+        self._stream.close()
+        self._stream = None
             
-        self.audio.terminate()
+        # PyAudio itself stays initialized so the recorder can be started
+        # again without re-enumerating devices; close() releases it.
+        # The frames are handed off, so a later stop() cannot return them again
+        frames, self.frames = self.frames, []
+        return frames
         
-        # Convert to MP3
+    def encode_mp3(self, frames: List[bytes]) -> bytes:
+        """Encode PCM frames returned by stop() as MP3 data"""
         wav_buffer = io.BytesIO()
         with wave.open(wav_buffer, 'wb') as wf:
             wf.setnchannels(self.channels)
             wf.setsampwidth(self.audio.get_sample_size(self.format))
             wf.setframerate(self.rate)
-            wf.writeframes(b''.join(self.frames))
+            wf.writeframes(b''.join(frames))
             
         wav_buffer.seek(0)
         audio_segment = AudioSegment.from_wav(wav_buffer)
@@ -86,3 +121,7 @@ class AudioRecorder:
         audio_segment.export(mp3_buffer, format='mp3', bitrate=self.mp3_bitrate)
         
         return mp3_buffer.getvalue()
+        
+    def close(self):
+        """Release PortAudio once the recorder is no longer needed"""
+        self.audio.terminate()
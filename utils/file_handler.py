@@ -256,18 +256,20 @@ class FileHandler:
         self.set_current_folder(folder_path)
         return self.get_mp3_files(folder_path)
         
-    def save_recording(self, audio_data: bytes, filename: str, metadata: dict = None) -> str:
+    def save_recording(self, audio_data: bytes, filename: str, metadata: dict = None,
+                       folder: Optional[str] = None) -> str:
         """Save a recording to the recordings folder with standardized naming.
         
         Args:
             audio_data: Raw audio data.
             filename: Base filename (will be standardized).
             metadata: Optional dictionary of metadata to save alongside recording.
+            folder: Folder to save into; defaults to today's recordings folder.
             
         Returns:
             str: Full path to saved recording.
         """
-        dated_folder = self.get_dated_folder("recordings")
+        dated_folder = folder or self.get_dated_folder("recordings")
         # Ensure filename follows YYMMDD_HHMM_name convention
         if not re.match(r'^\d{6}_\d{4}_.*$', filename):
             current_time = datetime.now()
@@ -0,0 +1,21 @@
+import os
+from pydub.utils import mediainfo_json
+
+# ffprobe results by absolute path, with the (mtime_ns, size) they were read at
+_PROBE_CACHE = {}
+
+def probe(path):
+    """ffprobe a media file, reusing the last result while it is unchanged"""
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _PROBE_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    info = mediainfo_json(key)
+    _PROBE_CACHE[key] = (stamp, info)
+    return info
+
+def probe_duration(path):
+    """Duration of a media file in seconds, 0 if it cannot be read"""
+    return float(probe(path).get('format', {}).get('duration') or 0)